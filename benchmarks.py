@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+import poker
+from jeu_poker import JeuPoker, indices_echange_heuristique, parser_carte
+from paquet import PaquetMasque
+from parties_auto import jouer_partie
+from poker import Carte, Main, CARTES, COULEURS, RANGS, NOMBRE_FORCES, comparer_mains, categorie_force
+
+VERSION: int = 2
+GRAINE: int = 2024
+TAILLE_ECHANTILLON: int = 1000
+SEUIL_DEFAUT: float = 0.25
+REPERTOIRE: str = os.path.dirname(os.path.abspath(__file__))
+CHEMIN_REFERENCE: str = os.path.join(REPERTOIRE, 'benchmarks_reference.json')
+
+NOMS_CATEGORIES: List[str] = ['carte_haute', 'paire', 'deux_paires', 'brelan', 'quinte',
+                              'couleur', 'full', 'carre', 'quinte_flush', 'quinte_flush_royale']
+
+Preparation = Callable[[random.Random], Tuple[Callable[[], object], int]]
+
+def main_de_force(force: int, generateur: random.Random) -> Main:
+    categorie, departage = poker._EVALUATIONS[force]
+    
+    if categorie in (4, 8, 9):
+        haut = 12 if categorie == 9 else departage[0]
+        rangs = [3, 2, 1, 0, 12] if haut == 3 else [haut - i for i in range(5)]
+    elif categorie == 7:
+        rangs = [departage[0]] * 4 + [departage[1]]
+    elif categorie == 6:
+        rangs = [departage[0]] * 3 + [departage[1]] * 2
+    elif categorie == 3:
+        rangs = [departage[0]] * 3 + list(departage[1:])
+    elif categorie == 2:
+        rangs = [departage[0]] * 2 + [departage[1]] * 2 + [departage[2]]
+    elif categorie == 1:
+        rangs = [departage[0]] * 2 + list(departage[1:])
+    else:
+        rangs = list(departage)
+    
+    if categorie in (5, 8, 9):
+        couleur = generateur.choice(COULEURS)
+        return Main([Carte(RANGS[rang], couleur) for rang in rangs])
+    
+    while True:
+        cartes: List[Carte] = []
+        for rang in rangs:
+            libres = [couleur for couleur in COULEURS if Carte(RANGS[rang], couleur) not in cartes]
+            cartes.append(Carte(RANGS[rang], generateur.choice(libres)))
+        main = Main(cartes)
+        if main.force() == force:
+            return main
+
+def _mains_aleatoires(generateur: random.Random, nombre: int = TAILLE_ECHANTILLON) -> List[Main]:
+    return [Main(generateur.sample(CARTES, 5)) for _ in range(nombre)]
+
+def _preparer_carte(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+    paires = [(rang, couleur) for couleur in COULEURS for rang in RANGS]
+    generateur.shuffle(paires)
+    return (lambda: [Carte(rang, couleur) for rang, couleur in paires]), len(paires)
+
+def _preparer_main(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+    tirages = [generateur.sample(CARTES, 5) for _ in range(TAILLE_ECHANTILLON)]
+    return (lambda: [Main(cartes) for cartes in tirages]), len(tirages)
+
+def _preparer_evaluer(mains: List[Main]) -> Tuple[Callable[[], object], int]:
+    tirages = [main.cartes for main in mains]
+    return (lambda: [Main(cartes).evaluer() for cartes in tirages]), len(tirages)
+
+def _preparer_evaluer_cache(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+    mains = _mains_aleatoires(generateur)
+    return (lambda: [main.evaluer() for main in mains]), len(mains)
+
+def _preparer_evaluer_melange(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+    return _preparer_evaluer(_mains_aleatoires(generateur))
+
+def _preparation_categorie(categorie: int) -> Preparation:
+    forces = [force for force in range(1, NOMBRE_FORCES + 1) if categorie_force(force) == categorie]
+    
+    def preparer(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+        return _preparer_evaluer([main_de_force(generateur.choice(forces), generateur) for _ in range(200)])
+    
+    return preparer
+
+def _preparer_comparer(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+    # Les mains sont recréées à chaque mesure : sinon leurs forces, mises en cache
+    # dès le premier passage, masqueraient le coût de l'évaluation.
+    tirages = [main.cartes for main in _mains_aleatoires(generateur)]
+    paires = list(zip(tirages, tirages[1:]))
+    return (lambda: [comparer_mains(Main(cartes1), Main(cartes2)) for cartes1, cartes2 in paires]), len(paires)
+
+def _preparer_parser(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+    formes = ['AC', '10C', 'VP', 'KT', 'DH', '7♥', '2♠', 'As Coeur', 'Roi Pique', '9 Trèfle', 'QD', '5S']
+    textes = [generateur.choice(formes) for _ in range(TAILLE_ECHANTILLON)]
+    return (lambda: [parser_carte(texte) for texte in textes]), len(textes)
+
+def _preparer_distribuer(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+    random.seed(generateur.random())
+    jeu = JeuPoker()
+    return (lambda: [jeu.distribuer_main() for _ in range(TAILLE_ECHANTILLON)]), TAILLE_ECHANTILLON
+
+def _preparer_distribuer_paquet(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+    jeu = JeuPoker(paquet=PaquetMasque(random.Random(generateur.random())))
+    return (lambda: [jeu.distribuer_main() for _ in range(TAILLE_ECHANTILLON)]), TAILLE_ECHANTILLON
+
+def _preparer_echanger_ordi(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+    tirages = [main.cartes for main in _mains_aleatoires(generateur)]
+    jeu = JeuPoker(paquet=PaquetMasque(random.Random(generateur.random())))
+    
+    def executer() -> None:
+        for cartes in tirages:
+            jeu.paquet.reinitialiser()
+            jeu.main_ordi = Main(cartes)
+            jeu.echanger_cartes_ordi()
+    
+    return executer, len(tirages)
+
+def _preparer_partie(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+    jeu = JeuPoker(paquet=PaquetMasque(random.Random(generateur.random())))
+    return (lambda: [jouer_partie(jeu, indices_echange_heuristique) for _ in range(200)]), 200
+
+def _preparation_demarrage(code: str, cache_tables: bool = False) -> Preparation:
+    # Chaque opération lance un nouvel interpréteur : ce sont les coûts d'import
+    # et de construction des tables que paie un script ou un processus de calcul.
+    def preparer(generateur: random.Random) -> Tuple[Callable[[], object], int]:
+        environnement = {cle: valeur for cle, valeur in os.environ.items() if cle != poker.VARIABLE_CACHE_TABLES}
+        if cache_tables:
+            chemin = os.path.join(tempfile.gettempdir(), f"poker_tables_v{poker.VERSION_TABLES}.bin")
+            poker.sauvegarder_tables(chemin)
+            environnement[poker.VARIABLE_CACHE_TABLES] = chemin
+        commande = [sys.executable, '-c', code]
+        return (lambda: subprocess.run(commande, cwd=REPERTOIRE, env=environnement, check=True)), 1
+    
+    return preparer
+
+_PREMIERE_EVALUATION: str = "import poker; poker.Main(poker.CARTES[:5]).force()"
+
+BENCHMARKS: Dict[str, Preparation] = {
+    'carte': _preparer_carte,
+    'main': _preparer_main,
+    'evaluer_melange': _preparer_evaluer_melange,
+    'evaluer_cache': _preparer_evaluer_cache,
+    **{f"evaluer_{nom}": _preparation_categorie(categorie) for categorie, nom in enumerate(NOMS_CATEGORIES)},
+    'comparer_mains': _preparer_comparer,
+    'parser_carte': _preparer_parser,
+    'distribuer_main': _preparer_distribuer,
+    'distribuer_main_paquet': _preparer_distribuer_paquet,
+    'echanger_cartes_ordi': _preparer_echanger_ordi,
+    'partie': _preparer_partie,
+    'demarrage_import_poker': _preparation_demarrage("import poker"),
+    'demarrage_import_jeu_poker': _preparation_demarrage("import jeu_poker"),
+    'demarrage_premiere_evaluation': _preparation_demarrage(_PREMIERE_EVALUATION),
+    'demarrage_premiere_evaluation_cache': _preparation_demarrage(_PREMIERE_EVALUATION, cache_tables=True),
+}
+
+def executer(filtre: Optional[str] = None, repetitions: int = 5, graine: int = GRAINE) -> Dict[str, float]:
+    resultats: Dict[str, float] = {}
+    
+    for nom, preparer in BENCHMARKS.items():
+        if filtre and filtre not in nom:
+            continue
+        
+        fonction, operations = preparer(random.Random(f"{graine}:{nom}"))
+        chrono = timeit.Timer(fonction)
+        nombre, _ = chrono.autorange()
+        meilleur = min(chrono.repeat(repeat=repetitions, number=nombre))
+        resultats[nom] = operations * nombre / meilleur
+    
+    return resultats
+
+def comparer_reference(resultats: Dict[str, float], reference: Dict[str, float],
+                       seuil: float = SEUIL_DEFAUT) -> List[str]:
+    regressions: List[str] = []
+    for nom, operations in resultats.items():
+        attendu = reference.get(nom)
+        if attendu and operations < attendu * (1 - seuil):
+            regressions.append(f"{nom}: {operations:.0f} ops/s au lieu de {attendu:.0f} ops/s "
+                               f"({operations / attendu - 1:+.0%})")
+    return regressions
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Mesures de performance du jeu de poker")
+    analyseur.add_argument('--filtre', help="ne lancer que les mesures dont le nom contient ce texte")
+    analyseur.add_argument('--repetitions', type=int, default=5)
+    analyseur.add_argument('--sortie', help="fichier JSON où écrire les résultats")
+    analyseur.add_argument('--reference', default=CHEMIN_REFERENCE)
+    analyseur.add_argument('--seuil', type=float, default=SEUIL_DEFAUT,
+                           help="baisse relative tolérée par rapport à la référence")
+    analyseur.add_argument('--enregistrer', action='store_true', help="enregistrer les résultats comme référence")
+    arguments = analyseur.parse_args()
+    
+    resultats = executer(arguments.filtre, arguments.repetitions)
+    for nom, operations in resultats.items():
+        print(f"{nom:<32} {operations:>14,.0f} ops/s")
+    
+    document = {
+        'version': VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'resultats': resultats,
+    }
+    if arguments.sortie:
+        with open(arguments.sortie, 'w', encoding='utf-8') as fichier:
+            json.dump(document, fichier, indent=2)
+    
+    if arguments.enregistrer:
+        with open(arguments.reference, 'w', encoding='utf-8') as fichier:
+            json.dump(document, fichier, indent=2)
+        print(f"référence enregistrée: {arguments.reference}")
+        return
+    
+    if not os.path.exists(arguments.reference):
+        print("aucune référence: utilisez --enregistrer pour en créer une")
+        return
+    
+    with open(arguments.reference, encoding='utf-8') as fichier:
+        reference = json.load(fichier)
+    if reference.get('version') != VERSION:
+        print("référence enregistrée par une autre version des mesures: utilisez --enregistrer")
+        return
+    
+    regressions = comparer_reference(resultats, reference.get('resultats', {}), arguments.seuil)
+    if regressions:
+        print("régressions détectées:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("aucune régression")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from historique import parser_main
+from instrumentation import Mesure
+from jeu_poker import indices_echange_heuristique
+from poker import Main
+
+async def _requete(lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter,
+                   commande: str, latences: Mesure) -> str:
+    debut = time.perf_counter()
+    ecrivain.write((commande + "\n").encode('utf-8'))
+    await ecrivain.drain()
+    reponse = (await lecteur.readline()).decode('utf-8').strip()
+    latences.enregistrer(time.perf_counter() - debut)
+    
+    if not reponse:
+        raise ConnectionError("connexion fermée par le serveur")
+    if reponse.startswith("ERREUR"):
+        raise RuntimeError(reponse)
+    return reponse
+
+async def _session(hote: str, port: int, chemin_unix: Optional[str], parties: int,
+                   latences: Mesure, resultats: Dict[str, int]) -> None:
+    if chemin_unix is not None:
+        lecteur, ecrivain = await asyncio.open_unix_connection(chemin_unix)
+    else:
+        lecteur, ecrivain = await asyncio.open_connection(hote, port)
+    
+    try:
+        identifiant = (await _requete(lecteur, ecrivain, "NOUVELLE", latences)).split()[1]
+        for partie in range(parties):
+            if partie:
+                await _requete(lecteur, ecrivain, f"NOUVELLE {identifiant}", latences)
+            
+            reponse = await _requete(lecteur, ecrivain, f"DISTRIBUER {identifiant}", latences)
+            main = Main(parser_main(reponse.split(maxsplit=2)[2]))
+            indices = " ".join(str(i) for i in indices_echange_heuristique(main))
+            await _requete(lecteur, ecrivain, f"ECHANGER {identifiant} {indices}", latences)
+            
+            gagnant = (await _requete(lecteur, ecrivain, f"ABATTRE {identifiant}", latences)).split()[2]
+            resultats[gagnant] = resultats.get(gagnant, 0) + 1
+        
+        await _requete(lecteur, ecrivain, "QUITTER", latences)
+    finally:
+        ecrivain.close()
+
+async def generer_charge(hote: str = '127.0.0.1', port: int = 7000, chemin_unix: Optional[str] = None,
+                         tables: int = 100, parties: int = 10) -> Dict[str, Any]:
+    latences = Mesure()
+    resultats: Dict[str, int] = {}
+    
+    debut = time.perf_counter()
+    issues = await asyncio.gather(*(_session(hote, port, chemin_unix, parties, latences, resultats)
+                                    for _ in range(tables)), return_exceptions=True)
+    duree = time.perf_counter() - debut
+    
+    erreurs: List[str] = [repr(issue) for issue in issues if isinstance(issue, BaseException)]
+    parties_jouees = sum(resultats.values())
+    return {
+        'tables': tables,
+        'parties': parties_jouees,
+        'erreurs': len(erreurs),
+        'premieres_erreurs': erreurs[:5],
+        'duree': duree,
+        'parties_par_seconde': parties_jouees / duree if duree else 0.0,
+        'tables_par_seconde': (tables - len(erreurs)) / duree if duree else 0.0,
+        'resultats': resultats,
+        'latences': latences.en_dict(),
+    }
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Générateur de charge pour le serveur de poker")
+    analyseur.add_argument('--hote', default='127.0.0.1')
+    analyseur.add_argument('--port', type=int, default=7000)
+    analyseur.add_argument('--unix', help="chemin d'un socket Unix à la place de TCP")
+    analyseur.add_argument('--tables', type=int, default=100, help="tables simultanées")
+    analyseur.add_argument('--parties', type=int, default=10, help="parties jouées par table")
+    arguments = analyseur.parse_args()
+    
+    bilan = asyncio.run(generer_charge(arguments.hote, arguments.port, arguments.unix,
+                                       arguments.tables, arguments.parties))
+    print(json.dumps(bilan, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
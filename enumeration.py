@@ -0,0 +1,152 @@
+import argparse
+from array import array
+from collections import Counter
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+import poker
+from jeu_poker import parser_carte
+from poker import Carte, CARTES, NOMBRE_FORCES, categorie_force, nom_combinaison
+from simulation import ResultatEquite
+
+# Nombre de mains de 5 cartes de chaque catégorie parmi les 2 598 960 possibles.
+FREQUENCES_CATEGORIES: Tuple[int, ...] = (1302540, 1098240, 123552, 54912, 10200, 5108, 3744, 624, 36, 4)
+
+# Couleur d'une main encore vide : la première carte choisie fixe la couleur possible.
+_TOUTES: int = 4
+
+def disponibles(connues: Sequence[Carte] = (), mortes: Sequence[Carte] = ()) -> List[Carte]:
+    if len(connues) > 5:
+        raise ValueError("une main contient au plus 5 cartes")
+    exclues = set(connues) | set(mortes)
+    if len(exclues) != len(connues) + len(mortes):
+        raise ValueError("les cartes connues et mortes doivent être distinctes")
+    if len(CARTES) - len(exclues) < 5 - len(connues):
+        raise ValueError("il ne reste pas assez de cartes pour compléter la main")
+    return [carte for carte in CARTES if carte not in exclues]
+
+def _parcourir(premiers: List[int], bits: List[int], couleurs: List[int], niveau: int, fin: int,
+               produit: int, masque: int, couleur: int, sortie: 'array[int]') -> None:
+    # Les cartes sont choisies de la plus haute position à la plus basse : chaque
+    # niveau prolonge l'état (produit, masque, couleur) du précédent, et la dernière
+    # carte est ajoutée d'un seul bloc, ce qui donne l'ordre colexicographique.
+    par_produit = poker._FORCE_PAR_PRODUIT
+    if niveau == 1:
+        if couleur >= 0:
+            par_couleur = poker._FORCE_COULEUR
+            sortie.extend([
+                par_couleur[masque | bits[i]] if couleurs[i] == couleur else par_produit[produit * premiers[i]]
+                for i in range(fin)
+            ])
+        else:
+            sortie.extend([par_produit[produit * premiers[i]] for i in range(fin)])
+        return
+    
+    for i in range(niveau - 1, fin):
+        if couleur == _TOUTES:
+            suivante = couleurs[i]
+        else:
+            suivante = couleur if couleur == couleurs[i] else -1
+        _parcourir(premiers, bits, couleurs, niveau - 1, i, produit * premiers[i], masque | bits[i], suivante, sortie)
+
+def forces(connues: Sequence[Carte] = (), mortes: Sequence[Carte] = ()) -> 'array[int]':
+    restantes = disponibles(connues, mortes)
+    poker._assurer_tables()
+    sortie: 'array[int]' = array('H')
+    if len(connues) == 5:
+        sortie.append(poker._force_cartes_tables(connues))
+        return sortie
+    
+    produit = 1
+    masque = 0
+    couleur = _TOUTES
+    for carte in connues:
+        produit *= carte.premier
+        masque |= carte.bit
+        if couleur == _TOUTES:
+            couleur = carte.indice_couleur
+        elif couleur != carte.indice_couleur:
+            couleur = -1
+    
+    _parcourir([carte.premier for carte in restantes], [carte.bit for carte in restantes],
+               [carte.indice_couleur for carte in restantes], 5 - len(connues), len(restantes),
+               produit, masque, couleur, sortie)
+    return sortie
+
+def _colex(elements: Sequence[Carte], nombre: int, fin: int) -> Iterator[Tuple[Carte, ...]]:
+    if not nombre:
+        yield ()
+        return
+    for i in range(nombre - 1, fin):
+        carte = elements[i]
+        for debut in _colex(elements, nombre - 1, i):
+            yield debut + (carte,)
+
+def mains(connues: Sequence[Carte] = (), mortes: Sequence[Carte] = ()) -> Iterator[Tuple[Carte, ...]]:
+    restantes = disponibles(connues, mortes)
+    base = tuple(connues)
+    for completion in _colex(restantes, 5 - len(base), len(restantes)):
+        yield base + completion
+
+def comptes_forces(connues: Sequence[Carte] = (), mortes: Sequence[Carte] = ()) -> List[int]:
+    comptes = [0] * (NOMBRE_FORCES + 1)
+    for force, nombre in Counter(forces(connues, mortes)).items():
+        comptes[force] = nombre
+    return comptes
+
+def frequences_categories(connues: Sequence[Carte] = (), mortes: Sequence[Carte] = ()) -> List[int]:
+    frequences = [0] * 10
+    for force, nombre in enumerate(comptes_forces(connues, mortes)):
+        if nombre:
+            frequences[categorie_force(force)] += nombre
+    return frequences
+
+def equite_exacte(cartes: Sequence[Carte], mortes: Sequence[Carte] = ()) -> ResultatEquite:
+    if len(cartes) != 5:
+        raise ValueError("l'équité exacte demande une main complète de 5 cartes")
+    force = forces(cartes, mortes)[0]
+    comptes = comptes_forces(mortes=list(cartes) + list(mortes))
+    return ResultatEquite(sum(comptes[:force]), comptes[force], sum(comptes[force + 1:]))
+
+def comparer_moteur(moteur: Callable[[Sequence[Carte]], int], limite: int = 10,
+                    connues: Sequence[Carte] = (), mortes: Sequence[Carte] = ()) -> List[Tuple[Tuple[Carte, ...], int, int]]:
+    ecarts: List[Tuple[Tuple[Carte, ...], int, int]] = []
+    for main, attendue in zip(mains(connues, mortes), forces(connues, mortes)):
+        obtenue = moteur(main)
+        if obtenue != attendue:
+            ecarts.append((main, attendue, obtenue))
+            if len(ecarts) >= limite:
+                break
+    return ecarts
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Énumération exhaustive des mains de 5 cartes")
+    analyseur.add_argument('commande', choices=['frequences', 'equite'])
+    analyseur.add_argument('cartes', nargs='*', help="cartes connues (ex: AC RC)")
+    analyseur.add_argument('--mortes', nargs='*', default=[], help="cartes exclues du paquet")
+    arguments = analyseur.parse_args()
+    
+    try:
+        cartes = [Carte(*parser_carte(texte)) for texte in arguments.cartes]
+        mortes = [Carte(*parser_carte(texte)) for texte in arguments.mortes]
+        if arguments.commande == 'equite':
+            resultat = equite_exacte(cartes, mortes)
+        else:
+            frequences = frequences_categories(cartes, mortes)
+    except ValueError as e:
+        analyseur.error(str(e))
+    
+    if arguments.commande == 'equite':
+        print(f"mains adverses: {resultat.essais}")
+        print(f"victoires: {resultat.victoires} ({resultat.victoires / resultat.essais:.4%})")
+        print(f"égalités: {resultat.egalites} ({resultat.egalites / resultat.essais:.4%})")
+        print(f"défaites: {resultat.defaites} ({resultat.defaites / resultat.essais:.4%})")
+        print(f"équité: {resultat.equite:.6f}")
+        return
+    
+    total = sum(frequences)
+    for categorie in range(9, -1, -1):
+        print(f"{nom_combinaison(categorie):<22} {frequences[categorie]:>9} {frequences[categorie] / total:>9.4%}")
+    print(f"{'total':<22} {total:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+from itertools import combinations_with_replacement
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+import poker
+from poker import Main, PREMIERS
+
+# Poids de Mian-Chowla : toute somme de deux poids est unique. Connaissant le masque
+# des rangs présents, la somme des poids des cinq cartes identifie donc les rangs
+# répétés, et décalage[masque] + somme donne directement l'indice dans la table.
+POIDS_RANGS: List[int] = [0, 1, 3, 7, 12, 20, 30, 44, 65, 80, 96, 122, 147]
+
+def _construire_tables() -> Tuple[np.ndarray, np.ndarray]:
+    decalages = np.zeros(1 << 13, dtype=np.int32)
+    forces: List[int] = []
+    
+    for masque in range(1 << 13):
+        rangs = [rang for rang in range(13) if masque >> rang & 1]
+        if not 2 <= len(rangs) <= 5:
+            continue
+        
+        base = sum(POIDS_RANGS[rang] for rang in rangs)
+        debut = len(forces)
+        decalages[masque] = debut - base
+        forces.extend([0] * (1 if len(rangs) == 5 else 3 * POIDS_RANGS[rangs[-1]] + 1))
+        
+        for valeurs in combinations_with_replacement(rangs, 5):
+            if valeurs[0] == valeurs[4] or len(set(valeurs)) != len(rangs):
+                continue
+            produit = 1
+            for valeur in valeurs:
+                produit *= PREMIERS[valeur]
+            forces[debut + sum(POIDS_RANGS[valeur] for valeur in valeurs) - base] = poker._FORCE_PAR_PRODUIT[produit]
+    
+    return decalages, np.array(forces, dtype=np.uint16)
+
+_DECALAGES, _FORCES_RANGS = _construire_tables()
+_FORCES_COULEUR = np.array(poker._FORCE_COULEUR, dtype=np.uint16)
+_BITS = np.array([1 << (code >> 2) for code in range(52)], dtype=np.uint16)
+_POIDS = np.array([POIDS_RANGS[code >> 2] for code in range(52)], dtype=np.int32)
+
+def codes_mains(mains: Iterable[Main]) -> np.ndarray:
+    return np.array([[carte.code for carte in main.cartes] for main in mains], dtype=np.uint8).reshape(-1, 5)
+
+def evaluer_lot(tableau: np.ndarray) -> np.ndarray:
+    codes = np.asarray(tableau)
+    if codes.ndim != 2 or codes.shape[1] != 5:
+        raise ValueError("le tableau doit être de forme (N, 5)")
+    if codes.size and (codes.min() < 0 or codes.max() > 51):
+        raise ValueError("code de carte non valide")
+    
+    colonnes = np.ascontiguousarray(codes.T, dtype=np.uint8)
+    
+    bits = _BITS[colonnes]
+    masques = bits[0] | bits[1] | bits[2] | bits[3] | bits[4]
+    poids = _POIDS[colonnes]
+    sommes = poids[0] + poids[1] + poids[2] + poids[3] + poids[4]
+    
+    forces = _FORCES_RANGS[_DECALAGES[masques] + sommes]
+    # Cinq cartes d'un même rang (donc des doublons) n'ont pas de décalage propre :
+    # leur somme tomberait sur la force d'une autre main.
+    forces[(masques & (masques - 1)) == 0] = 0
+    
+    couleurs = colonnes & 3
+    couleur = (couleurs[0] == couleurs[1]) & (couleurs[0] == couleurs[2]) & (couleurs[0] == couleurs[3]) & (couleurs[0] == couleurs[4])
+    forces[couleur] = _FORCES_COULEUR[masques[couleur]]
+    
+    return forces
+
+def _verifier_doublons(codes: np.ndarray) -> None:
+    # Une force nulle ne suffit pas : une carte répétée peut former une paire valide.
+    if (np.diff(np.sort(codes, axis=1), axis=1) == 0).any():
+        raise ValueError("une main contient des cartes en double")
+
+def comparer_lot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    forces_a = evaluer_lot(a)
+    forces_b = evaluer_lot(b)
+    if len(forces_a) != len(forces_b):
+        raise ValueError("les deux lots doivent contenir le même nombre de mains")
+    _verifier_doublons(np.asarray(a))
+    _verifier_doublons(np.asarray(b))
+    
+    return np.sign(forces_a.astype(np.int32) - forces_b.astype(np.int32)).astype(np.int8)
+
+def abattage_lot(tableau: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    tableau = np.asarray(tableau)
+    if tableau.ndim != 3 or tableau.shape[2] != 5:
+        raise ValueError("le tableau doit être de forme (tables, sièges, 5)")
+    
+    tables, sieges = tableau.shape[:2]
+    codes = tableau.reshape(tables * sieges, 5)
+    forces = evaluer_lot(codes).reshape(tables, sieges)
+    _verifier_doublons(codes)
+    
+    return forces, forces == forces.max(axis=1, keepdims=True)
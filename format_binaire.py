@@ -0,0 +1,241 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from historique import lire_lignes, parser_main
+from poker import Carte, Main, CARTES, force_cartes
+
+MAGIE: bytes = b'PKMN'
+VERSION: int = 1
+ENCODAGE_OCTET: int = 1
+ENCODAGE_6_BITS: int = 2
+DRAPEAU_FORCE: int = 1
+ENTETE = struct.Struct('<4sBBBxQ')
+TAILLE_LOT: int = 4096
+
+_ENREGISTREMENTS: Dict[Tuple[int, bool], struct.Struct] = {
+    (ENCODAGE_OCTET, False): struct.Struct('<5B'),
+    (ENCODAGE_OCTET, True): struct.Struct('<5BH'),
+    (ENCODAGE_6_BITS, False): struct.Struct('<I'),
+    (ENCODAGE_6_BITS, True): struct.Struct('<IH'),
+}
+
+ABREVIATIONS_RANG: Dict[str, str] = {'As': 'A', 'Roi': 'R', 'Dame': 'D', 'Valet': 'V'}
+ABREVIATIONS_COULEUR: Dict[str, str] = {'Coeur': 'C', 'Carreau': 'K', 'Trèfle': 'T', 'Pique': 'P'}
+
+def empaqueter(codes: Sequence[int]) -> int:
+    c0, c1, c2, c3, c4 = codes
+    return c0 | c1 << 6 | c2 << 12 | c3 << 18 | c4 << 24
+
+def depaqueter(valeur: int) -> Tuple[int, ...]:
+    return (valeur & 63, valeur >> 6 & 63, valeur >> 12 & 63, valeur >> 18 & 63, valeur >> 24 & 63)
+
+def texte_carte(carte: Carte) -> str:
+    return ABREVIATIONS_RANG.get(carte.rang, carte.rang) + ABREVIATIONS_COULEUR[carte.couleur]
+
+def texte_main(cartes: Iterable[Carte]) -> str:
+    return " ".join(texte_carte(carte) for carte in cartes)
+
+def _lire_entete(donnees: bytes) -> Tuple[int, bool, int]:
+    if len(donnees) < ENTETE.size:
+        raise ValueError("fichier de mains tronqué")
+    magie, version, encodage, drapeaux, nombre = ENTETE.unpack_from(donnees)
+    if magie != MAGIE or version != VERSION or (encodage, bool(drapeaux & DRAPEAU_FORCE)) not in _ENREGISTREMENTS:
+        raise ValueError("fichier de mains non valide")
+    return encodage, bool(drapeaux & DRAPEAU_FORCE), nombre
+
+class EcrivainMains:
+    def __init__(self, chemin: str, encodage: int = ENCODAGE_6_BITS, avec_force: bool = True,
+                 taille_lot: int = TAILLE_LOT) -> None:
+        if (encodage, avec_force) not in _ENREGISTREMENTS:
+            raise ValueError(f"Encodage non valide: {encodage}")
+        
+        if os.path.exists(chemin) and os.path.getsize(chemin) > 0:
+            self._fichier = open(chemin, 'r+b')
+            try:
+                encodage_existant, force_existante, self.nombre = _lire_entete(self._fichier.read(ENTETE.size))
+            except ValueError:
+                self._fichier.close()
+                raise
+            if (encodage_existant, force_existante) != (encodage, avec_force):
+                self._fichier.close()
+                raise ValueError("le fichier existant utilise un autre encodage")
+            taille = _ENREGISTREMENTS[(encodage, avec_force)].size
+            if os.path.getsize(chemin) < ENTETE.size + self.nombre * taille:
+                self._fichier.close()
+                raise ValueError("fichier de mains tronqué")
+            self._fichier.seek(ENTETE.size + self.nombre * taille)
+            self._fichier.truncate()
+        else:
+            self._fichier = open(chemin, 'w+b')
+            self.nombre = 0
+            self._fichier.write(ENTETE.pack(MAGIE, VERSION, encodage, DRAPEAU_FORCE if avec_force else 0, 0))
+        
+        self.encodage: int = encodage
+        self.avec_force: bool = avec_force
+        self._format = _ENREGISTREMENTS[(encodage, avec_force)]
+        self._tampon = bytearray()
+        self._en_attente: int = 0
+        self._taille_lot: int = taille_lot
+    
+    def ecrire_codes(self, codes: Sequence[int], force: int = 0) -> None:
+        if self.encodage == ENCODAGE_6_BITS:
+            valeurs: Tuple[int, ...] = (empaqueter(codes),)
+        else:
+            valeurs = tuple(codes)
+        if self.avec_force:
+            valeurs += (force or force_cartes([CARTES[code] for code in codes]),)
+        
+        self._tampon += self._format.pack(*valeurs)
+        self._en_attente += 1
+        if self._en_attente >= self._taille_lot:
+            self.vider()
+    
+    def ecrire(self, cartes: Sequence[Carte]) -> None:
+        self.ecrire_codes([carte.code for carte in cartes], force_cartes(cartes) if self.avec_force else 0)
+    
+    def ecrire_lot(self, mains: Iterable[Main]) -> None:
+        for main in mains:
+            self.ecrire(main.cartes)
+    
+    def vider(self) -> None:
+        if not self._en_attente:
+            return
+        self._fichier.write(self._tampon)
+        self.nombre += self._en_attente
+        self._tampon.clear()
+        self._en_attente = 0
+        
+        position = self._fichier.tell()
+        self._fichier.seek(ENTETE.size - 8)
+        self._fichier.write(struct.pack('<Q', self.nombre))
+        self._fichier.seek(position)
+    
+    def fermer(self) -> None:
+        self.vider()
+        self._fichier.close()
+    
+    def __enter__(self) -> 'EcrivainMains':
+        return self
+    
+    def __exit__(self, *exception: object) -> None:
+        self.fermer()
+
+class LecteurMains:
+    def __init__(self, chemin: str) -> None:
+        with open(chemin, 'rb') as fichier:
+            self._mmap = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        try:
+            self.encodage, self.avec_force, self.nombre = _lire_entete(self._mmap)
+        except ValueError:
+            self._mmap.close()
+            raise
+        
+        self._format = _ENREGISTREMENTS[(self.encodage, self.avec_force)]
+        self.taille_enregistrement: int = self._format.size
+        if len(self._mmap) < ENTETE.size + self.nombre * self.taille_enregistrement:
+            self._mmap.close()
+            raise ValueError("fichier de mains tronqué")
+    
+    def __len__(self) -> int:
+        return self.nombre
+    
+    def vue(self) -> memoryview:
+        fin = ENTETE.size + self.nombre * self.taille_enregistrement
+        return memoryview(self._mmap)[ENTETE.size:fin].cast('B', (self.nombre, self.taille_enregistrement))
+    
+    def tableau(self) -> Any:
+        import numpy as np
+        
+        champs: List[Tuple[Any, ...]] = [('cartes', 'u1', (5,)) if self.encodage == ENCODAGE_OCTET else ('cartes', '<u4')]
+        if self.avec_force:
+            champs.append(('force', '<u2'))
+        return np.frombuffer(self._mmap, dtype=np.dtype(champs), count=self.nombre, offset=ENTETE.size)
+    
+    def codes_tableau(self) -> Any:
+        import numpy as np
+        
+        cartes = self.tableau()['cartes']
+        if self.encodage == ENCODAGE_OCTET:
+            return cartes
+        return ((cartes[:, None] >> np.arange(0, 30, 6, dtype=np.uint32)) & 63).astype(np.uint8)
+    
+    def enregistrement(self, indice: int) -> Tuple[Tuple[int, ...], int]:
+        if not 0 <= indice < self.nombre:
+            raise IndexError("indice de main hors limites")
+        valeurs = self._format.unpack_from(self._mmap, ENTETE.size + indice * self.taille_enregistrement)
+        
+        if self.encodage == ENCODAGE_6_BITS:
+            codes = depaqueter(valeurs[0])
+        else:
+            codes = valeurs[:5]
+        return codes, valeurs[-1] if self.avec_force else 0
+    
+    def main(self, indice: int) -> Main:
+        return Main([CARTES[code] for code in self.enregistrement(indice)[0]])
+    
+    def __iter__(self) -> Iterator[Main]:
+        return (self.main(indice) for indice in range(self.nombre))
+    
+    def fermer(self) -> None:
+        # Des vues (memoryview, tableaux NumPy) peuvent survivre au lecteur : le
+        # mmap sera alors fermé par le ramasse-miettes quand la dernière disparaîtra.
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+    
+    def __enter__(self) -> 'LecteurMains':
+        return self
+    
+    def __exit__(self, *exception: object) -> None:
+        self.fermer()
+
+def texte_vers_binaire(source: str, destination: str, encodage: int = ENCODAGE_6_BITS, avec_force: bool = True,
+                       erreurs: Optional[TextIO] = None) -> Tuple[int, int]:
+    ecrites = rejetees = 0
+    with EcrivainMains(destination, encodage, avec_force) as ecrivain:
+        for numero, brute in enumerate(lire_lignes(source), start=1):
+            try:
+                ligne = brute.decode('utf-8')
+                if not ligne.strip():
+                    continue
+                ecrivain.ecrire(parser_main(ligne))
+                ecrites += 1
+            except (UnicodeDecodeError, ValueError) as e:
+                rejetees += 1
+                if erreurs is not None:
+                    erreurs.write(f"ligne {numero}: {e}\n")
+    return ecrites, rejetees
+
+def binaire_vers_texte(source: str, destination: TextIO) -> int:
+    with LecteurMains(source) as lecteur:
+        for indice in range(len(lecteur)):
+            codes, _ = lecteur.enregistrement(indice)
+            destination.write(texte_main(CARTES[code] for code in codes) + "\n")
+        return len(lecteur)
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Conversion entre historiques texte et fichiers binaires de mains")
+    analyseur.add_argument('commande', choices=['vers-binaire', 'vers-texte'])
+    analyseur.add_argument('source')
+    analyseur.add_argument('destination')
+    analyseur.add_argument('--octets', action='store_true', help="un octet par carte au lieu de 6 bits")
+    analyseur.add_argument('--sans-force', action='store_true', help="ne pas stocker la force des mains")
+    arguments = analyseur.parse_args()
+    
+    if arguments.commande == 'vers-binaire':
+        encodage = ENCODAGE_OCTET if arguments.octets else ENCODAGE_6_BITS
+        ecrites, rejetees = texte_vers_binaire(arguments.source, arguments.destination, encodage,
+                                               not arguments.sans_force, sys.stderr)
+        print(f"{ecrites} mains écrites, {rejetees} lignes rejetées")
+    else:
+        with open(arguments.destination, 'w', encoding='utf-8') as destination:
+            print(f"{binaire_vers_texte(arguments.source, destination)} mains écrites")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import mmap
+import sys
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from jeu_poker import FORMES_CARTES
+from poker import Carte, categorie_force, force_cartes, nom_combinaison
+
+TAILLE_TAMPON: int = 1 << 20
+
+CARTES_PAR_JETON: Dict[str, Carte] = {forme: Carte(rang, couleur) for forme, (rang, couleur) in FORMES_CARTES.items()}
+
+def parser_main(ligne: str) -> List[Carte]:
+    mots = ligne.replace(',', ' ').split()
+    cartes: List[Carte] = []
+    
+    i = 0
+    while i < len(mots):
+        carte = CARTES_PAR_JETON.get(mots[i])
+        if carte is None and i + 1 < len(mots):
+            carte = CARTES_PAR_JETON.get(f"{mots[i]} {mots[i + 1]}")
+            i += carte is not None
+        if carte is None:
+            raise ValueError(f"carte non reconnue: {mots[i]}")
+        cartes.append(carte)
+        i += 1
+    
+    if len(cartes) != 5:
+        raise ValueError(f"une main doit contenir exactement 5 cartes, pas {len(cartes)}")
+    if len(set(cartes)) != 5:
+        raise ValueError("la main contient des cartes en double")
+    return cartes
+
+def lire_lignes(chemin: str, utiliser_mmap: bool = False) -> Iterator[bytes]:
+    if chemin == '-':
+        yield from sys.stdin.buffer
+        return
+    
+    with open(chemin, 'rb', buffering=TAILLE_TAMPON) as fichier:
+        if not utiliser_mmap:
+            yield from fichier
+            return
+        
+        try:
+            carte_memoire = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return
+        with carte_memoire:
+            yield from iter(carte_memoire.readline, b'')
+
+class Bilan:
+    def __init__(self) -> None:
+        self.lignes: int = 0
+        self.mains: int = 0
+        self.erreurs: int = 0
+        self.categories: List[int] = [0] * 10
+
+def traiter(lignes: Iterator[bytes], sortie: Optional[TextIO] = None,
+            erreurs: Optional[TextIO] = None) -> Bilan:
+    bilan = Bilan()
+    categories = bilan.categories
+    
+    for numero, brute in enumerate(lignes, start=1):
+        bilan.lignes = numero
+        try:
+            ligne = brute.decode('utf-8')
+            if not ligne.strip():
+                continue
+            force = force_cartes(parser_main(ligne))
+        except (UnicodeDecodeError, ValueError) as e:
+            bilan.erreurs += 1
+            if erreurs is not None:
+                erreurs.write(f"ligne {numero}: {e}\n")
+            continue
+        
+        categorie = categorie_force(force)
+        categories[categorie] += 1
+        bilan.mains += 1
+        if sortie is not None:
+            sortie.write(f"{force}\t{nom_combinaison(categorie)}\n")
+    
+    return bilan
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Évaluation en flux d'historiques de mains (une main par ligne)")
+    analyseur.add_argument('fichier', help="fichier d'historique, ou - pour l'entrée standard")
+    analyseur.add_argument('--sortie', help="fichier où écrire la force et la catégorie de chaque main")
+    analyseur.add_argument('--agreger', action='store_true', help="n'afficher que le nombre de mains par catégorie")
+    analyseur.add_argument('--mmap', action='store_true', help="lire le fichier par projection en mémoire")
+    arguments = analyseur.parse_args()
+    
+    sortie: Optional[TextIO] = None
+    if not arguments.agreger:
+        sortie = open(arguments.sortie, 'w', encoding='utf-8', buffering=TAILLE_TAMPON) if arguments.sortie else sys.stdout
+    
+    try:
+        bilan = traiter(lire_lignes(arguments.fichier, arguments.mmap), sortie, sys.stderr)
+    finally:
+        if sortie is not None and sortie is not sys.stdout:
+            sortie.close()
+    
+    if arguments.agreger:
+        for categorie in range(9, -1, -1):
+            print(f"{nom_combinaison(categorie)}: {bilan.categories[categorie]}")
+    print(f"{bilan.mains} mains évaluées, {bilan.erreurs} lignes en erreur sur {bilan.lignes}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import json
+import random
+import sys
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import jeu_poker
+import poker
+from poker import categorie_force, nom_combinaison
+
+TAILLE_RESERVOIR: int = 10_000
+QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99)
+
+class Mesure:
+    __slots__ = ('appels', 'duree_totale', 'echantillons', '_generateur')
+    
+    def __init__(self) -> None:
+        self.appels: int = 0
+        self.duree_totale: float = 0.0
+        self.echantillons: List[float] = []
+        self._generateur = random.Random(0)
+    
+    def enregistrer(self, duree: float) -> None:
+        self.appels += 1
+        self.duree_totale += duree
+        if len(self.echantillons) < TAILLE_RESERVOIR:
+            self.echantillons.append(duree)
+        else:
+            position = self._generateur.randrange(self.appels)
+            if position < TAILLE_RESERVOIR:
+                self.echantillons[position] = duree
+    
+    def quantile(self, q: float) -> float:
+        if not self.echantillons:
+            return 0.0
+        ordonnes = sorted(self.echantillons)
+        return ordonnes[min(int(q * len(ordonnes)), len(ordonnes) - 1)]
+    
+    def en_dict(self) -> Dict[str, float]:
+        resultat: Dict[str, float] = {
+            'appels': self.appels,
+            'duree_totale': self.duree_totale,
+            'moyenne': self.duree_totale / self.appels if self.appels else 0.0,
+        }
+        for q in QUANTILES:
+            resultat[f"p{round(q * 100)}"] = self.quantile(q)
+        return resultat
+
+_mesures: Dict[str, Mesure] = {}
+_categories: List[int] = [0] * 10
+_originaux: List[Tuple[Any, str, Any]] = []
+
+def _chronometrer(nom: str, fonction: Callable[..., Any],
+                  observer: Optional[Callable[[Any], None]] = None) -> Callable[..., Any]:
+    mesure = _mesures.setdefault(nom, Mesure())
+    
+    @wraps(fonction)
+    def enveloppe(*args: Any, **kwargs: Any) -> Any:
+        debut = time.perf_counter()
+        resultat = fonction(*args, **kwargs)
+        mesure.enregistrer(time.perf_counter() - debut)
+        if observer is not None:
+            observer(resultat)
+        return resultat
+    
+    return enveloppe
+
+def _observer_evaluation(evaluation: Tuple[int, List[int]]) -> None:
+    _categories[evaluation[0]] += 1
+
+def _observer_force(force: int) -> None:
+    if force:
+        _categories[categorie_force(force)] += 1
+
+def _cibles() -> List[Tuple[Any, str, str, Optional[Callable[[Any], None]]]]:
+    return [
+        (poker.Main, 'evaluer', 'Main.evaluer', _observer_evaluation),
+        (poker.Main, 'force', 'Main.force', _observer_force),
+        (poker, 'comparer_mains', 'comparer_mains', None),
+        (jeu_poker, 'comparer_mains', 'comparer_mains', None),
+        (jeu_poker.JeuPoker, 'distribuer_main', 'JeuPoker.distribuer_main', None),
+        (jeu_poker.JeuPoker, 'echanger_cartes_joueur', 'JeuPoker.echanger_cartes_joueur', None),
+        (jeu_poker.JeuPoker, 'echanger_cartes_ordi', 'JeuPoker.echanger_cartes_ordi', None),
+        (jeu_poker.JeuPoker, 'determiner_gagnant', 'JeuPoker.determiner_gagnant', None),
+    ]
+
+def est_active() -> bool:
+    return bool(_originaux)
+
+def activer() -> None:
+    if _originaux:
+        return
+    
+    enveloppes: Dict[int, Callable[..., Any]] = {}
+    for proprietaire, attribut, nom, observer in _cibles():
+        original = proprietaire.__dict__[attribut]
+        if id(original) not in enveloppes:
+            enveloppes[id(original)] = _chronometrer(nom, original, observer)
+        _originaux.append((proprietaire, attribut, original))
+        setattr(proprietaire, attribut, enveloppes[id(original)])
+
+def desactiver() -> None:
+    while _originaux:
+        proprietaire, attribut, original = _originaux.pop()
+        setattr(proprietaire, attribut, original)
+
+def reinitialiser() -> None:
+    for mesure in _mesures.values():
+        mesure.__init__()
+    _categories[:] = [0] * 10
+
+@contextmanager
+def instrumenter() -> Iterator[None]:
+    activer()
+    try:
+        yield
+    finally:
+        desactiver()
+
+def _statistiques_caches() -> Dict[str, Dict[str, int]]:
+    caches: Dict[str, Dict[str, int]] = {'forces': poker.statistiques_cache_forces()}
+    moteur = sys.modules.get('moteur_echange')
+    if moteur is not None:
+        caches['moteur_echange'] = moteur.statistiques_cache()
+    probabilites = sys.modules.get('probabilites')
+    if probabilites is not None:
+        caches['probabilites'] = probabilites.statistiques_cache()
+    return caches
+
+def instantane() -> Dict[str, Any]:
+    return {
+        'fonctions': {nom: mesure.en_dict() for nom, mesure in _mesures.items() if mesure.appels},
+        'categories': {nom_combinaison(categorie): nombre for categorie, nombre in enumerate(_categories)},
+        'caches': _statistiques_caches(),
+    }
+
+def exporter_json() -> str:
+    return json.dumps(instantane(), indent=2, ensure_ascii=False)
+
+def exporter_prometheus() -> str:
+    donnees = instantane()
+    lignes: List[str] = [
+        "# TYPE poker_appels_total counter",
+        *(f'poker_appels_total{{fonction="{nom}"}} {mesure["appels"]}'
+          for nom, mesure in donnees['fonctions'].items()),
+        "# TYPE poker_duree_secondes_total counter",
+        *(f'poker_duree_secondes_total{{fonction="{nom}"}} {mesure["duree_totale"]:.9f}'
+          for nom, mesure in donnees['fonctions'].items()),
+        "# TYPE poker_latence_secondes summary",
+    ]
+    for nom, mesure in donnees['fonctions'].items():
+        for q in QUANTILES:
+            lignes.append(f'poker_latence_secondes{{fonction="{nom}",quantile="{q}"}} '
+                          f'{mesure[f"p{round(q * 100)}"]:.9f}')
+    
+    lignes.append("# TYPE poker_mains_evaluees_total counter")
+    lignes.extend(f'poker_mains_evaluees_total{{categorie="{nom}"}} {nombre}'
+                  for nom, nombre in donnees['categories'].items())
+    
+    lignes.append("# TYPE poker_cache_succes_total counter")
+    lignes.extend(f'poker_cache_succes_total{{cache="{nom}"}} {cache["succes"]}'
+                  for nom, cache in donnees['caches'].items())
+    lignes.append("# TYPE poker_cache_echecs_total counter")
+    lignes.extend(f'poker_cache_echecs_total{{cache="{nom}"}} {cache["echecs"]}'
+                  for nom, cache in donnees['caches'].items())
+    
+    return "\n".join(lignes) + "\n"
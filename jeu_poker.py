@@ -1,23 +1,39 @@
 import random
-from typing import List, Optional, Literal, Tuple, Dict
-from poker import Carte, Main, comparer_mains, nom_combinaison, RANGS, COULEURS
+from typing import Callable, List, Optional, Literal, Sequence, Tuple, Dict, Union
+from poker import Abattage, Carte, Main, classer_mains, comparer_mains, nom_combinaison, RANGS, COULEURS, JEU_ORDONNE
+from paquet import PaquetMasque
+
+StrategieEchange = Callable[[Main], List[int]]
 
 class JeuPoker:
-    def __init__(self) -> None:
-        self.jeu: List[Carte] = self.creer_jeu()
+    def __init__(self, strategie_ordi: Optional[StrategieEchange] = None,
+                 paquet: Optional[PaquetMasque] = None) -> None:
+        self.paquet: Optional[PaquetMasque] = paquet
+        self.jeu: Union[List[Carte], PaquetMasque] = paquet if paquet is not None else self.creer_jeu()
         self.main_joueur: Optional[Main] = None
         self.main_ordi: Optional[Main] = None
+        self.strategie_ordi: Optional[StrategieEchange] = strategie_ordi
     
     def creer_jeu(self) -> List[Carte]:
-        return [Carte(rang, couleur) for couleur in COULEURS for rang in RANGS]
+        return list(JEU_ORDONNE)
     
     def melanger(self) -> None:
-        random.shuffle(self.jeu)
+        if self.paquet is not None:
+            self.paquet.melanger()
+        else:
+            random.shuffle(self.jeu)
     
-    def distribuer_main(self) -> Main:
-        if len(self.jeu) < 5:
+    def renouveler_jeu(self) -> None:
+        if self.paquet is not None:
+            self.paquet.reinitialiser()
+            self.jeu = self.paquet
+        else:
             self.jeu = self.creer_jeu()
             self.melanger()
+    
+    def distribuer_main(self) -> Main:
+        if len(self.jeu) < 5:
+            self.renouveler_jeu()
         
         cartes: List[Carte] = []
         for _ in range(5):
@@ -26,8 +42,7 @@ class JeuPoker:
         return Main(cartes)
     
     def nouvelle_partie(self) -> None:
-        self.jeu = self.creer_jeu()
-        self.melanger()
+        self.renouveler_jeu()
         self.main_ordi = self.distribuer_main()
     
     def definir_main_joueur(self, cartes: List[Carte]) -> None:
@@ -39,56 +54,29 @@ class JeuPoker:
         if not indices or not self.main_joueur:
             return
         
-        cartes: List[Carte] = list(self.main_joueur.cartes)
+        remplacements: Dict[int, Carte] = {}
         for i in sorted(indices, reverse=True):
             if 0 <= i < 5:
-                cartes.pop(i)
-                cartes.insert(i, self.jeu.pop())
+                remplacements[i] = self.jeu.pop()
         
-        self.main_joueur = Main(cartes)
+        self.main_joueur = self.main_joueur.remplacer(remplacements)
     
-    def echanger_cartes_ordi(self) -> None:
+    def echanger_cartes_ordi(self, indices: Optional[List[int]] = None) -> None:
         if not self.main_ordi:
             return
-            
-        main: Main = self.main_ordi
-        eval_main: int = main.evaluer()[0]
-        cartes: List[Carte] = list(main.cartes)
         
-        if eval_main >= 4:
+        if indices is None:
+            strategie: StrategieEchange = self.strategie_ordi or indices_echange_heuristique
+            indices = strategie(self.main_ordi)
+        indices_a_changer: List[int] = indices
+        if not indices_a_changer:
             return
         
-        indices_a_changer: List[int] = []
-        valeurs: Dict[int, List[int]] = {}
-        
-        for i, carte in enumerate(cartes):
-            valeurs.setdefault(carte.valeur, []).append(i)
-        
-        if eval_main == 3:
-            for val, indices in valeurs.items():
-                if len(indices) != 3:
-                    indices_a_changer.extend(indices)
-        
-        elif eval_main == 2:
-            for val, indices in valeurs.items():
-                if len(indices) == 1:
-                    indices_a_changer.extend(indices)
-        
-        elif eval_main == 1:
-            for val, indices in valeurs.items():
-                if len(indices) == 1:
-                    indices_a_changer.extend(indices)
-        
-        else:
-            for i, carte in enumerate(cartes):
-                if carte.valeur < 10:
-                    indices_a_changer.append(i)
-        
+        remplacements: Dict[int, Carte] = {}
         for i in sorted(indices_a_changer, reverse=True):
-            cartes.pop(i)
-            cartes.insert(i, self.jeu.pop())
+            remplacements[i] = self.jeu.pop()
         
-        self.main_ordi = Main(cartes)
+        self.main_ordi = self.main_ordi.remplacer(remplacements)
     
     def determiner_gagnant(self) -> Literal["joueur", "ordinateur", "égalité"]:
         if not self.main_joueur or not self.main_ordi:
@@ -103,6 +91,84 @@ class JeuPoker:
         else:
             return "égalité"
 
+SIEGES_MIN: int = 2
+SIEGES_MAX: int = 10
+
+class TablePoker(JeuPoker):
+    def __init__(self, sieges: int = 6, strategies: Optional[Sequence[Optional[StrategieEchange]]] = None,
+                 paquet: Optional[PaquetMasque] = None) -> None:
+        if not SIEGES_MIN <= sieges <= SIEGES_MAX:
+            raise ValueError(f"une table compte entre {SIEGES_MIN} et {SIEGES_MAX} sièges")
+        if strategies is not None and len(strategies) != sieges:
+            raise ValueError("il faut une stratégie (ou None) par siège")
+        
+        super().__init__(paquet=paquet)
+        self.sieges: int = sieges
+        self.strategies: List[Optional[StrategieEchange]] = list(strategies) if strategies is not None else [None] * sieges
+        self.mains: List[Main] = []
+    
+    def nouvelle_partie(self) -> None:
+        self.renouveler_jeu()
+        self.mains = [self.distribuer_main() for _ in range(self.sieges)]
+    
+    def echanger_cartes(self, siege: int, indices: List[int]) -> None:
+        if not self.mains:
+            raise ValueError("les mains ne sont pas initialisées")
+        
+        indices = sorted({i for i in indices if 0 <= i < 5}, reverse=True)
+        if len(indices) > len(self.jeu):
+            raise ValueError("plus assez de cartes dans le jeu pour cet échange")
+        
+        remplacements: Dict[int, Carte] = {i: self.jeu.pop() for i in indices}
+        self.mains[siege] = self.mains[siege].remplacer(remplacements)
+    
+    def echanger_cartes_automatiques(self) -> None:
+        for siege, strategie in enumerate(self.strategies):
+            if strategie is not None:
+                self.echanger_cartes(siege, strategie(self.mains[siege]))
+    
+    def abattage(self) -> Abattage:
+        if not self.mains:
+            raise ValueError("les mains ne sont pas initialisées")
+        return classer_mains(self.mains)
+    
+    def determiner_gagnants(self) -> List[int]:
+        return self.abattage().gagnants
+
+def indices_echange_heuristique(main: Main) -> List[int]:
+    eval_main: int = main.categorie()
+    
+    if eval_main >= 4:
+        return []
+    
+    indices_a_changer: List[int] = []
+    valeurs: Dict[int, List[int]] = {}
+    
+    for i, carte in enumerate(main.cartes):
+        valeurs.setdefault(carte.valeur, []).append(i)
+    
+    if eval_main == 3:
+        for val, indices in valeurs.items():
+            if len(indices) != 3:
+                indices_a_changer.extend(indices)
+    
+    elif eval_main == 2:
+        for val, indices in valeurs.items():
+            if len(indices) == 1:
+                indices_a_changer.extend(indices)
+    
+    elif eval_main == 1:
+        for val, indices in valeurs.items():
+            if len(indices) == 1:
+                indices_a_changer.extend(indices)
+    
+    else:
+        for i, carte in enumerate(main.cartes):
+            if carte.valeur < 10:
+                indices_a_changer.append(i)
+    
+    return indices_a_changer
+
 def afficher_main(main: Main, cacher: bool = False) -> str:
     if cacher:
         return "? ? ? ? ?"
@@ -114,8 +180,8 @@ def afficher_resultat(jeu: JeuPoker) -> None:
         raise ValueError("les mains ne sont pas initialisées")
         
     print("\nresultat final:")
-    print(f"votre main: {afficher_main(jeu.main_joueur)} - {nom_combinaison(jeu.main_joueur.evaluer()[0])}")
-    print(f"main de l'ordinateur: {afficher_main(jeu.main_ordi)} - {nom_combinaison(jeu.main_ordi.evaluer()[0])}")
+    print(f"votre main: {afficher_main(jeu.main_joueur)} - {nom_combinaison(jeu.main_joueur.categorie())}")
+    print(f"main de l'ordinateur: {afficher_main(jeu.main_ordi)} - {nom_combinaison(jeu.main_ordi.categorie())}")
     
     gagnant: str = jeu.determiner_gagnant()
     if gagnant == "joueur":
@@ -125,9 +191,42 @@ def afficher_resultat(jeu: JeuPoker) -> None:
     else:
         print("egalité!")
 
+CONVERSION_COULEUR: Dict[str, str] = {
+    'C': 'Coeur', 'H': 'Coeur', '♥': 'Coeur',
+    'K': 'Carreau', 'D': 'Carreau', '♦': 'Carreau',
+    'T': 'Trèfle', 'F': 'Trèfle', '♣': 'Trèfle',
+    'P': 'Pique', 'S': 'Pique', '♠': 'Pique'
+}
+
+CONVERSION_RANG: Dict[str, str] = {
+    'A': 'As', 'J': 'Valet', 'V': 'Valet', 
+    'Q': 'Dame', 'D': 'Dame', 
+    'K': 'Roi', 'R': 'Roi'
+}
+
+def _formes_cartes() -> Dict[str, Tuple[str, str]]:
+    formes_rang: Dict[str, str] = {rang: rang for rang in RANGS}
+    formes_rang.update(CONVERSION_RANG)
+    
+    formes: Dict[str, Tuple[str, str]] = {}
+    for forme_rang, rang in formes_rang.items():
+        for abreviation, couleur in CONVERSION_COULEUR.items():
+            formes[forme_rang + abreviation] = (rang, couleur)
+        for couleur in COULEURS:
+            formes[f"{forme_rang} {couleur}"] = (rang, couleur)
+    return formes
+
+# Toutes les écritures valides d'une carte, précalculées : la saisie courante
+# se résout en une seule recherche, les autres passent par l'analyse détaillée.
+FORMES_CARTES: Dict[str, Tuple[str, str]] = _formes_cartes()
+
 def parser_carte(texte: str) -> Tuple[str, str]:
     texte = texte.strip()
     
+    forme = FORMES_CARTES.get(texte)
+    if forme is not None:
+        return forme
+    
     parties = texte.split()
     if len(parties) == 2:
         rang, couleur = parties
@@ -137,26 +236,13 @@ def parser_carte(texte: str) -> Tuple[str, str]:
         rang = texte[:-1]
         couleur_abbr = texte[-1]
         
-        conversion_couleur = {
-            'C': 'Coeur', 'H': 'Coeur', '♥': 'Coeur',
-            'K': 'Carreau', 'D': 'Carreau', '♦': 'Carreau',
-            'T': 'Trèfle', 'F': 'Trèfle', '♣': 'Trèfle',
-            'P': 'Pique', 'S': 'Pique', '♠': 'Pique'
-        }
-        
-        if couleur_abbr in conversion_couleur:
-            couleur = conversion_couleur[couleur_abbr]
+        if couleur_abbr in CONVERSION_COULEUR:
+            couleur = CONVERSION_COULEUR[couleur_abbr]
         else:
             raise ValueError(f"Couleur non reconnue: {couleur_abbr}")
     
-    conversion_rang = {
-        'A': 'As', 'J': 'Valet', 'V': 'Valet', 
-        'Q': 'Dame', 'D': 'Dame', 
-        'K': 'Roi', 'R': 'Roi'
-    }
-    
-    if rang in conversion_rang:
-        rang = conversion_rang[rang]
+    if rang in CONVERSION_RANG:
+        rang = CONVERSION_RANG[rang]
     
     if rang not in RANGS:
         raise ValueError(f"Rang non valide: {rang}")
@@ -0,0 +1,127 @@
+from array import array
+from itertools import compress
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import poker
+from format_binaire import ENCODAGE_6_BITS, EcrivainMains, LecteurMains, depaqueter, empaqueter
+from poker import Carte, Main, CARTES
+
+# Une main occupe 6 octets : ses cinq codes de carte sur 6 bits dans un entier de
+# 32 bits (comme ENCODAGE_6_BITS de format_binaire) et sa force sur 16 bits. Les
+# objets Main ne sont créés qu'à la demande, quand on indexe ou parcourt le lot.
+class LotMains:
+    __slots__ = ('paquets', 'forces')
+    
+    def __init__(self, paquets: Iterable[int] = (), forces: Optional[Iterable[int]] = None) -> None:
+        self.paquets: 'array[int]' = array('I', paquets)
+        if forces is None:
+            self.forces: 'array[int]' = array('H', (_force_paquet(paquet) for paquet in self.paquets))
+        else:
+            self.forces = array('H', forces)
+            if len(self.forces) != len(self.paquets):
+                raise ValueError("il faut une force par main")
+    
+    @classmethod
+    def depuis_mains(cls, mains: Iterable[Main]) -> 'LotMains':
+        lot = cls()
+        for main in mains:
+            lot.paquets.append(empaqueter([carte.code for carte in main.cartes]))
+            lot.forces.append(main.force())
+        return lot
+    
+    @classmethod
+    def depuis_codes(cls, codes: Iterable[Sequence[int]]) -> 'LotMains':
+        lot = cls()
+        for main in codes:
+            lot.ajouter_codes(main)
+        return lot
+    
+    @classmethod
+    def charger(cls, chemin: str) -> 'LotMains':
+        with LecteurMains(chemin) as lecteur:
+            lot = cls()
+            for indice in range(len(lecteur)):
+                codes, force = lecteur.enregistrement(indice)
+                lot.paquets.append(empaqueter(codes))
+                lot.forces.append(force if lecteur.avec_force else _force_paquet(lot.paquets[-1]))
+        return lot
+    
+    def sauvegarder(self, chemin: str) -> None:
+        with EcrivainMains(chemin, ENCODAGE_6_BITS, avec_force=True) as ecrivain:
+            for paquet, force in zip(self.paquets, self.forces):
+                ecrivain.ecrire_codes(depaqueter(paquet), force)
+    
+    def ajouter_codes(self, codes: Sequence[int]) -> None:
+        if len(set(codes)) != 5 or len(codes) != 5 or min(codes) < 0 or max(codes) > 51:
+            raise ValueError(f"codes de main non valides: {list(codes)}")
+        self.paquets.append(empaqueter(codes))
+        self.forces.append(poker.force_cartes([CARTES[code] for code in codes]))
+    
+    def ajouter(self, cartes: Sequence[Carte]) -> None:
+        self.ajouter_codes([carte.code for carte in cartes])
+    
+    def __len__(self) -> int:
+        return len(self.paquets)
+    
+    @overload
+    def __getitem__(self, indice: int) -> Main: ...
+    
+    @overload
+    def __getitem__(self, indice: slice) -> 'LotMains': ...
+    
+    def __getitem__(self, indice: Union[int, slice]) -> Union[Main, 'LotMains']:
+        if isinstance(indice, slice):
+            return _lot(self.paquets[indice], self.forces[indice])
+        
+        paquet = self.paquets[indice]
+        main = Main([CARTES[code] for code in depaqueter(paquet)])
+        # La force est déjà connue : la main n'aura pas à être réévaluée.
+        poker._poser_force(main, self.forces[indice])
+        return main
+    
+    def __iter__(self) -> Iterator[Main]:
+        return (self[indice] for indice in range(len(self.paquets)))
+    
+    def codes(self, indice: int) -> Tuple[int, ...]:
+        return depaqueter(self.paquets[indice])
+    
+    def categories(self) -> bytes:
+        poker._assurer_tables()
+        return bytes(map(poker._CATEGORIES.__getitem__, self.forces))
+    
+    def comptes_categories(self) -> List[int]:
+        categories = self.categories()
+        return [categories.count(categorie) for categorie in range(10)]
+    
+    def filtrer_categorie(self, *categories: int) -> 'LotMains':
+        selection = self.categories().translate(bytes(categorie in categories for categorie in range(256)))
+        return _lot(array('I', compress(self.paquets, selection)), array('H', compress(self.forces, selection)))
+    
+    def trier(self, decroissant: bool = False) -> 'LotMains':
+        ordre = sorted(range(len(self.forces)), key=self.forces.__getitem__, reverse=decroissant)
+        paquets = self.paquets
+        forces = self.forces
+        return _lot(array('I', [paquets[i] for i in ordre]), array('H', [forces[i] for i in ordre]))
+    
+    def taille_octets(self) -> int:
+        return len(self.paquets) * (self.paquets.itemsize + self.forces.itemsize)
+    
+    def tableaux(self) -> Tuple[Any, Any]:
+        import numpy as np
+        
+        return np.frombuffer(self.paquets, dtype=np.uint32), np.frombuffer(self.forces, dtype=np.uint16)
+    
+    def codes_tableau(self) -> Any:
+        import numpy as np
+        
+        paquets, _ = self.tableaux()
+        return ((paquets[:, None] >> np.arange(0, 30, 6, dtype=np.uint32)) & 63).astype(np.uint8)
+
+def _force_paquet(paquet: int) -> int:
+    return poker.force_cartes([CARTES[code] for code in depaqueter(paquet)])
+
+def _lot(paquets: 'array[int]', forces: 'array[int]') -> LotMains:
+    lot = LotMains()
+    lot.paquets = paquets
+    lot.forces = forces
+    return lot
@@ -0,0 +1,103 @@
+import random
+from functools import lru_cache
+from itertools import combinations, combinations_with_replacement
+from math import comb
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import poker
+from poker import Carte, Main, CARTES, NOMBRE_FORCES, PREMIERS, canoniser, evaluateur_tirage
+
+TIRAGE_EXACT_MAX: int = 2
+ECHANTILLONS: int = 1000
+
+def repartition_forces() -> List[int]:
+    nombres: List[int] = [0] * (NOMBRE_FORCES + 1)
+    
+    for valeurs in combinations_with_replacement(range(13), 5):
+        if valeurs[0] == valeurs[4]:
+            continue
+        
+        produit = 1
+        masque = 0
+        for valeur in valeurs:
+            produit *= PREMIERS[valeur]
+            masque |= 1 << valeur
+        
+        if len(set(valeurs)) == 5:
+            nombres[poker._FORCE_PAR_PRODUIT[produit]] += 4 ** 5 - 4
+            nombres[poker._FORCE_COULEUR[masque]] += 4
+        else:
+            combinaisons = 1
+            for valeur in set(valeurs):
+                combinaisons *= comb(4, valeurs.count(valeur))
+            nombres[poker._FORCE_PAR_PRODUIT[produit]] += combinaisons
+    
+    return nombres
+
+def _probabilites_victoire() -> List[float]:
+    nombres = repartition_forces()
+    total = sum(nombres)
+    
+    probabilites: List[float] = [0.0] * (NOMBRE_FORCES + 1)
+    inferieures = 0
+    for force in range(1, NOMBRE_FORCES + 1):
+        probabilites[force] = (inferieures + nombres[force] / 2) / total
+        inferieures += nombres[force]
+    
+    return probabilites
+
+# Probabilité qu'une main de force donnée batte une main de 5 cartes tirée au hasard,
+# une égalité comptant pour moitié : c'est le gain attendu contre l'adversaire.
+PROBA_VICTOIRE: List[float] = _probabilites_victoire()
+
+def esperance_tirage(gardees: Sequence[Carte], exclues: Sequence[Carte],
+                     generateur: Optional[random.Random] = None, echantillons: int = ECHANTILLONS) -> float:
+    manquantes = 5 - len(gardees)
+    interdites = set(gardees) | set(exclues)
+    restantes: List[Carte] = [carte for carte in CARTES if carte not in interdites]
+    evaluer = evaluateur_tirage(gardees)
+    
+    if manquantes == 0:
+        return PROBA_VICTOIRE[evaluer(())]
+    
+    tirages: Iterable[Sequence[Carte]]
+    if manquantes <= TIRAGE_EXACT_MAX:
+        tirages = combinations(restantes, manquantes)
+        nombre = comb(len(restantes), manquantes)
+    else:
+        generateur = generateur or random.Random(0)
+        tirages = (generateur.sample(restantes, manquantes) for _ in range(echantillons))
+        nombre = echantillons
+    
+    total = 0.0
+    for tirage in tirages:
+        total += PROBA_VICTOIRE[evaluer(tirage)]
+    return total / nombre
+
+_MASQUES_PAR_TAILLE: List[int] = sorted(range(32), key=lambda masque: -masque.bit_count())
+
+@lru_cache(maxsize=None)
+def _decision_canonique(codes: Tuple[int, ...]) -> int:
+    cartes: List[Carte] = [CARTES[code] for code in codes]
+    generateur = random.Random(str(codes))
+    
+    meilleur_masque = 31
+    meilleure_esperance = -1.0
+    for masque in _MASQUES_PAR_TAILLE:
+        gardees = [carte for i, carte in enumerate(cartes) if masque >> i & 1]
+        jetees = [carte for i, carte in enumerate(cartes) if not masque >> i & 1]
+        esperance = esperance_tirage(gardees, jetees, generateur)
+        if esperance > meilleure_esperance:
+            meilleur_masque, meilleure_esperance = masque, esperance
+    
+    return meilleur_masque
+
+def choisir_echange(main: Main) -> List[int]:
+    cle, _, permutation = canoniser(main.cartes)
+    codes = [carte.valeur << 2 | permutation[carte.indice_couleur] for carte in main.cartes]
+    masque = _decision_canonique(cle)
+    return [i for i, code in enumerate(codes) if not masque >> cle.index(code) & 1]
+
+def statistiques_cache() -> Dict[str, int]:
+    infos = _decision_canonique.cache_info()
+    return {'succes': infos.hits, 'echecs': infos.misses, 'taille': infos.currsize}
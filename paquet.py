@@ -0,0 +1,63 @@
+import random
+from array import array
+from typing import Iterable, Iterator, List, Optional
+
+from poker import Carte, CARTES
+
+class PaquetMasque:
+    __slots__ = ('_indices', '_positions', '_restantes', 'masque', '_generateur')
+    
+    def __init__(self, generateur: Optional[random.Random] = None) -> None:
+        self._indices: 'array[int]' = array('B', range(52))
+        self._positions: 'array[int]' = array('B', range(52))
+        self._restantes: int = 52
+        self.masque: int = 0
+        self._generateur = generateur if generateur is not None else random
+    
+    def reinitialiser(self) -> None:
+        self._restantes = 52
+        self.masque = 0
+    
+    def melanger(self) -> None:
+        pass
+    
+    def __len__(self) -> int:
+        return self._restantes
+    
+    def __iter__(self) -> Iterator[Carte]:
+        indices = self._indices
+        return (CARTES[indices[i]] for i in range(self._restantes))
+    
+    def __contains__(self, carte: object) -> bool:
+        return isinstance(carte, Carte) and not self.masque >> carte.code & 1
+    
+    def _sortir(self, position: int) -> int:
+        indices = self._indices
+        derniere = self._restantes - 1
+        code = indices[position]
+        autre = indices[derniere]
+        indices[position] = autre
+        indices[derniere] = code
+        self._positions[autre] = position
+        self._positions[code] = derniere
+        self._restantes = derniere
+        self.masque |= 1 << code
+        return code
+    
+    def pop(self) -> Carte:
+        if not self._restantes:
+            raise IndexError("le paquet est vide")
+        return CARTES[self._sortir(self._generateur.randrange(self._restantes))]
+    
+    def tirer(self, nombre: int) -> List[Carte]:
+        if nombre > self._restantes:
+            raise IndexError("le paquet ne contient pas assez de cartes")
+        return [self.pop() for _ in range(nombre)]
+    
+    def retirer(self, cartes: Iterable[Carte]) -> None:
+        for carte in cartes:
+            if not self.masque >> carte.code & 1:
+                self._sortir(self._positions[carte.code])
+    
+    def est_sortie(self, carte: Carte) -> bool:
+        return bool(self.masque >> carte.code & 1)
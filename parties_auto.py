@@ -0,0 +1,137 @@
+import argparse
+import random
+import time
+from typing import Dict, List, Union
+
+import moteur_echange
+import probabilites
+from jeu_poker import JeuPoker, StrategieEchange, indices_echange_heuristique
+from paquet import PaquetMasque
+from poker import Main, nom_combinaison
+from tables_partagees import executeur_partage
+
+TAILLE_LOT: int = 10_000
+
+def strategie_aucun_echange(main: Main) -> List[int]:
+    return []
+
+STRATEGIES: Dict[str, StrategieEchange] = {
+    'aucun': strategie_aucun_echange,
+    'heuristique': indices_echange_heuristique,
+    'optimale': moteur_echange.choisir_echange,
+    'exacte': probabilites.choisir_echange,
+}
+
+def resoudre_strategie(strategie: Union[str, StrategieEchange]) -> StrategieEchange:
+    if callable(strategie):
+        return strategie
+    if strategie not in STRATEGIES:
+        raise ValueError(f"Stratégie inconnue: {strategie}")
+    return STRATEGIES[strategie]
+
+class StatistiquesParties:
+    def __init__(self) -> None:
+        self.parties: int = 0
+        self.victoires_joueur: int = 0
+        self.victoires_ordi: int = 0
+        self.egalites: int = 0
+        self.categories_joueur: List[int] = [0] * 10
+        self.categories_ordi: List[int] = [0] * 10
+        self.duree: float = 0.0
+    
+    def fusionner(self, autre: 'StatistiquesParties') -> None:
+        self.parties += autre.parties
+        self.victoires_joueur += autre.victoires_joueur
+        self.victoires_ordi += autre.victoires_ordi
+        self.egalites += autre.egalites
+        for categorie in range(10):
+            self.categories_joueur[categorie] += autre.categories_joueur[categorie]
+            self.categories_ordi[categorie] += autre.categories_ordi[categorie]
+    
+    @property
+    def parties_par_seconde(self) -> float:
+        return self.parties / self.duree if self.duree else 0.0
+    
+    def en_dict(self) -> Dict[str, object]:
+        return {
+            'parties': self.parties,
+            'victoires_joueur': self.victoires_joueur,
+            'victoires_ordi': self.victoires_ordi,
+            'egalites': self.egalites,
+            'categories_joueur': {nom_combinaison(c): n for c, n in enumerate(self.categories_joueur)},
+            'categories_ordi': {nom_combinaison(c): n for c, n in enumerate(self.categories_ordi)},
+            'duree': self.duree,
+            'parties_par_seconde': self.parties_par_seconde,
+        }
+
+def jouer_partie(jeu: JeuPoker, strategie_joueur: StrategieEchange) -> str:
+    jeu.nouvelle_partie()
+    jeu.main_joueur = jeu.distribuer_main()
+    jeu.echanger_cartes_joueur(strategie_joueur(jeu.main_joueur))
+    jeu.echanger_cartes_ordi()
+    return jeu.determiner_gagnant()
+
+def _jouer_lot(nombre: int, joueur: Union[str, StrategieEchange], ordi: Union[str, StrategieEchange],
+               graine: int, lot: int) -> StatistiquesParties:
+    strategie_joueur = resoudre_strategie(joueur)
+    jeu = JeuPoker(strategie_ordi=resoudre_strategie(ordi), paquet=PaquetMasque(random.Random(f"{graine}:{lot}")))
+    statistiques = StatistiquesParties()
+    
+    for _ in range(nombre):
+        gagnant = jouer_partie(jeu, strategie_joueur)
+        if gagnant == "joueur":
+            statistiques.victoires_joueur += 1
+        elif gagnant == "ordinateur":
+            statistiques.victoires_ordi += 1
+        else:
+            statistiques.egalites += 1
+        statistiques.categories_joueur[jeu.main_joueur.categorie()] += 1
+        statistiques.categories_ordi[jeu.main_ordi.categorie()] += 1
+    
+    statistiques.parties = nombre
+    return statistiques
+
+def jouer_parties(nombre: int, joueur: Union[str, StrategieEchange] = 'heuristique',
+                  ordi: Union[str, StrategieEchange] = 'heuristique', graine: int = 0,
+                  processus: int = 1, taille_lot: int = TAILLE_LOT) -> StatistiquesParties:
+    resoudre_strategie(joueur)
+    resoudre_strategie(ordi)
+    
+    tailles: List[int] = [min(taille_lot, nombre - debut) for debut in range(0, nombre, taille_lot)]
+    statistiques = StatistiquesParties()
+    debut_chrono = time.perf_counter()
+    
+    if processus <= 1:
+        for lot, taille in enumerate(tailles):
+            statistiques.fusionner(_jouer_lot(taille, joueur, ordi, graine, lot))
+    else:
+        with executeur_partage(processus) as executeur:
+            futurs = [executeur.submit(_jouer_lot, taille, joueur, ordi, graine, lot)
+                      for lot, taille in enumerate(tailles)]
+            for futur in futurs:
+                statistiques.fusionner(futur.result())
+    
+    statistiques.duree = time.perf_counter() - debut_chrono
+    return statistiques
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Parties de poker sans interface, pour tester les stratégies")
+    analyseur.add_argument('--parties', type=int, default=100_000)
+    analyseur.add_argument('--joueur', choices=sorted(STRATEGIES), default='heuristique')
+    analyseur.add_argument('--ordi', choices=sorted(STRATEGIES), default='heuristique')
+    analyseur.add_argument('--graine', type=int, default=0)
+    analyseur.add_argument('--processus', type=int, default=1)
+    arguments = analyseur.parse_args()
+    
+    statistiques = jouer_parties(arguments.parties, arguments.joueur, arguments.ordi,
+                                 arguments.graine, arguments.processus)
+    
+    print(f"parties: {statistiques.parties} ({statistiques.parties_par_seconde:.0f} parties/s)")
+    print(f"victoires joueur: {statistiques.victoires_joueur / statistiques.parties:.4f}")
+    print(f"victoires ordinateur: {statistiques.victoires_ordi / statistiques.parties:.4f}")
+    print(f"égalités: {statistiques.egalites / statistiques.parties:.4f}")
+    for categorie in range(9, -1, -1):
+        print(f"{nom_combinaison(categorie)}: {statistiques.categories_joueur[categorie]} / {statistiques.categories_ordi[categorie]}")
+
+if __name__ == "__main__":
+    main()
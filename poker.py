@@ -1,18 +1,56 @@
-from typing import List, Tuple, Dict
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from itertools import combinations_with_replacement
+from operator import attrgetter
+from typing import Callable, List, NamedTuple, Tuple, Dict, Optional, Sequence, Union
 
 COULEURS: List[str] = ['Coeur', 'Carreau', 'Trèfle', 'Pique']
 RANGS: List[str] = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Valet', 'Dame', 'Roi', 'As']
 VALEURS: Dict[str, int] = {rang: i for i, rang in enumerate(RANGS)}
+INDICES_COULEURS: Dict[str, int] = {couleur: i for i, couleur in enumerate(COULEURS)}
+SYMBOLES: Dict[str, str] = {'Coeur': '♥', 'Carreau': '♦', 'Trèfle': '♣', 'Pique': '♠'}
+PREMIERS: List[int] = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
 
 class Carte:
-    def __init__(self, rang: str, couleur: str) -> None:
-        self.rang: str = rang
-        self.couleur: str = couleur
-        self.valeur: int = VALEURS[rang]
-    
+    __slots__ = ('rang', 'couleur', 'valeur', 'indice_couleur', 'code', 'bit', 'masque', 'premier')
+
+    _instances: Dict[Tuple[str, str], 'Carte'] = {}
+
+    def __new__(cls, rang: str, couleur: str) -> 'Carte':
+        carte = cls._instances.get((rang, couleur))
+        if carte is not None:
+            return carte
+
+        if couleur not in INDICES_COULEURS:
+            raise ValueError(f"Couleur non valide: {couleur}")
+
+        carte = super().__new__(cls)
+        valeur: int = VALEURS[rang]
+        indice_couleur: int = INDICES_COULEURS[couleur]
+        object.__setattr__(carte, 'rang', rang)
+        object.__setattr__(carte, 'couleur', couleur)
+        object.__setattr__(carte, 'valeur', valeur)
+        object.__setattr__(carte, 'indice_couleur', indice_couleur)
+        object.__setattr__(carte, 'code', (valeur << 2) | indice_couleur)
+        object.__setattr__(carte, 'bit', 1 << valeur)
+        object.__setattr__(carte, 'masque', 1 << ((valeur << 2) | indice_couleur))
+        object.__setattr__(carte, 'premier', PREMIERS[valeur])
+        cls._instances[(rang, couleur)] = carte
+        return carte
+
+    def __setattr__(self, nom: str, valeur: object) -> None:
+        raise AttributeError("une carte est immuable")
+
+    def __reduce__(self) -> Tuple[type, Tuple[str, str]]:
+        return (Carte, (self.rang, self.couleur))
+
     def __str__(self) -> str:
-        symboles: Dict[str, str] = {'Coeur': '♥', 'Carreau': '♦', 'Trèfle': '♣', 'Pique': '♠'}
-        return f"{self.rang}{symboles[self.couleur]}"
+        return f"{self.rang}{SYMBOLES[self.couleur]}"
     
     def __repr__(self) -> str:
         return self.__str__()
@@ -23,18 +61,123 @@ class Carte:
     def __eq__(self, autre: object) -> bool:
         if not isinstance(autre, Carte):
             return NotImplemented
-        return self.valeur == autre.valeur and self.couleur == autre.couleur
+        return self.code == autre.code
+
+    def __hash__(self) -> int:
+        return self.code
+
+    @staticmethod
+    def depuis_code(code: int) -> 'Carte':
+        return CARTES[code]
+
+# Les 52 cartes sont créées une seule fois : le code d'une carte (rang << 2 | couleur)
+# sert d'indice dans CARTES, et JEU_ORDONNE suit l'ordre historique de creer_jeu.
+CARTES: List[Carte] = [Carte(RANGS[code >> 2], COULEURS[code & 3]) for code in range(52)]
+JEU_ORDONNE: Tuple[Carte, ...] = tuple(Carte(rang, couleur) for couleur in COULEURS for rang in RANGS)
+
+_valeur_carte = attrgetter('valeur')
 
 class Main:
-    def __init__(self, cartes: List[Carte]) -> None:
+    __slots__ = ('cartes', 'masque', '_force', '_etat')
+    
+    def __init__(self, cartes: Sequence[Carte]) -> None:
         if len(cartes) != 5:
             raise ValueError("Une main doit contenir exactement 5 cartes")
-        self.cartes: List[Carte] = sorted(cartes, reverse=True, key=lambda carte: carte.valeur)
+        c0, c1, c2, c3, c4 = cartes
+        _poser_cartes(self, tuple(sorted(cartes, reverse=True, key=_valeur_carte)))
+        _poser_masque(self, c0.masque | c1.masque | c2.masque | c3.masque | c4.masque)
+        _poser_force(self, -1)
+        _poser_etat(self, None)
+    
+    def __setattr__(self, nom: str, valeur: object) -> None:
+        raise AttributeError("une main est immuable")
+    
+    def __reduce__(self) -> Tuple[type, Tuple[Tuple[Carte, ...]]]:
+        return (Main, (self.cartes,))
+    
+    def __eq__(self, autre: object) -> bool:
+        if not isinstance(autre, Main):
+            return NotImplemented
+        if self.masque != autre.masque:
+            return False
+        return sorted(carte.code for carte in self.cartes) == sorted(carte.code for carte in autre.cartes)
+    
+    def __hash__(self) -> int:
+        return hash(self.masque)
     
     def __str__(self) -> str:
         return " ".join(str(carte) for carte in self.cartes)
     
+    def _calculer_force(self) -> int:
+        masque = self.masque
+        if masque.bit_count() != 5:
+            force = _force_cartes(self.cartes)
+        else:
+            force = _cache_forces.get(masque)
+            if force is not None:
+                _cache_forces.move_to_end(masque)
+                _statistiques_cache[0] += 1
+            else:
+                force = _force_cartes(self.cartes)
+                _statistiques_cache[1] += 1
+                if _taille_cache[0]:
+                    _cache_forces[masque] = force
+                    if len(_cache_forces) > _taille_cache[0]:
+                        _cache_forces.popitem(last=False)
+        _poser_force(self, force)
+        return force
+    
+    def force(self) -> int:
+        force = self._force
+        return force if force >= 0 else self._calculer_force()
+    
+    def categorie(self) -> int:
+        force = self._force
+        if force < 0:
+            force = self._calculer_force()
+        if not force:
+            return self.evaluer_par_predicats()[0]
+        if not _tables_pretes:
+            _assurer_tables()
+        return _CATEGORIES[force]
+    
     def evaluer(self) -> Tuple[int, List[int]]:
+        force = self._force
+        if force < 0:
+            force = self._calculer_force()
+        if not force:
+            return self.evaluer_par_predicats()
+        if not _tables_pretes:
+            _assurer_tables()
+        categorie, departage = _EVALUATIONS[force]
+        return (categorie, list(departage))
+    
+    def etat(self) -> 'EtatMain':
+        etat = self._etat
+        if etat is None:
+            etat = EtatMain(self.cartes)
+            _poser_etat(self, etat)
+        return etat.copier()
+    
+    def remplacer(self, remplacements: Dict[int, Carte]) -> 'Main':
+        etat = self._etat
+        if etat is None:
+            # Sans état déjà construit, réévaluer les 5 cartes d'un coup coûte
+            # moins cher que de bâtir l'état pour un seul échange.
+            cartes = list(self.cartes)
+            for indice, carte in remplacements.items():
+                cartes[indice] = carte
+            return Main(cartes)
+        
+        etat = etat.copier()
+        etat.echanger(remplacements)
+        main = Main(etat.cartes)
+        etat.cartes = list(main.cartes)
+        _poser_force(main, etat.force())
+        _poser_etat(main, etat)
+        return main
+    
+    def evaluer_par_predicats(self) -> Tuple[int, List[int]]:
         if self.est_quinte_flush_royale():
             return (9, [])
         elif self.est_quinte_flush():
@@ -118,10 +261,372 @@ class Main:
         groupes = self.get_valeurs_par_groupes()
         return len(groupes) >= 4 and groupes[0][1] == 2 and groupes[1][1] == 1
 
-def comparer_mains(main1: Main, main2: Main) -> int:
-    eval1 = main1.evaluer()
-    eval2 = main2.evaluer()
+# Les attributs d'une main immuable sont posés directement par leurs descripteurs
+# de slot, nettement moins coûteux qu'object.__setattr__ à chaque création.
+_poser_cartes = Main.cartes.__set__
+_poser_masque = Main.masque.__set__
+_poser_force = Main._force.__set__
+_poser_etat = Main._etat.__set__
+
+Evaluation = Tuple[int, Tuple[int, ...]]
+
+def _classer(valeurs: Sequence[int], couleur: bool) -> Evaluation:
+    comptes: Dict[int, int] = {}
+    for valeur in valeurs:
+        comptes[valeur] = comptes.get(valeur, 0) + 1
+    
+    groupes = sorted(comptes.items(), key=lambda x: (-x[1], -x[0]))
+    rangs = tuple(valeur for valeur, _ in groupes)
+    formes = [compte for _, compte in groupes]
+    
+    if len(groupes) == 5:
+        if rangs == (12, 3, 2, 1, 0):
+            quinte: Optional[int] = 3
+        elif rangs[0] - rangs[4] == 4:
+            quinte = rangs[0]
+        else:
+            quinte = None
+        
+        if quinte is not None and couleur:
+            return (9, ()) if quinte == 12 else (8, (quinte,))
+        elif quinte is not None:
+            return (4, (quinte,))
+        return (5 if couleur else 0, rangs)
     
+    if formes[0] == 4:
+        return (7, rangs)
+    elif formes == [3, 2]:
+        return (6, rangs)
+    elif formes[0] == 3:
+        return (3, rangs)
+    elif formes[:2] == [2, 2]:
+        return (2, rangs)
+    return (1, rangs)
+
+def _construire_tables() -> Tuple[Dict[int, int], 'array[int]', List[Evaluation]]:
+    classes: List[Tuple[Evaluation, int, bool]] = []
+    
+    for valeurs in combinations_with_replacement(range(13), 5):
+        if valeurs[0] == valeurs[4]:
+            continue
+        
+        produit = 1
+        masque = 0
+        for valeur in valeurs:
+            produit *= PREMIERS[valeur]
+            masque |= 1 << valeur
+        classes.append((_classer(valeurs, False), produit, False))
+        
+        if len(set(valeurs)) == 5:
+            classes.append((_classer(valeurs, True), masque, True))
+    
+    classes.sort()
+    
+    par_produit: Dict[int, int] = {}
+    par_couleur: 'array[int]' = array('H', bytes(2 << 13))
+    evaluations: List[Evaluation] = [(-1, ())]
+    
+    for force, (evaluation, cle, couleur) in enumerate(classes, start=1):
+        if couleur:
+            par_couleur[cle] = force
+        else:
+            par_produit[cle] = force
+        evaluations.append(evaluation)
+    
+    return par_produit, par_couleur, evaluations
+
+# Une main sans couleur est identifiée par le produit des nombres premiers de ses
+# rangs, une couleur par le masque de ses rangs : une seule recherche donne sa force,
+# rang de sa classe d'équivalence de 1 (7-5-4-3-2) à NOMBRE_FORCES (quinte flush royale).
+# Les tables ne sont construites (ou relues depuis le cache disque désigné par
+# POKER_CACHE_TABLES) qu'à la première évaluation : importer poker reste immédiat.
+NOMBRE_FORCES: int = 7462
+
+VERSION_TABLES: int = 1
+MAGIE_TABLES: bytes = b'PKEV'
+ENTETE_TABLES = struct.Struct('<4sHHIIII')
+VARIABLE_CACHE_TABLES: str = 'POKER_CACHE_TABLES'
+Tables = Tuple[Dict[int, int], Sequence[int], List[Evaluation]]
+
+_tables_pretes: bool = False
+
+def _serialiser_tables(tables: Tables) -> bytes:
+    par_produit, par_couleur, evaluations = tables
+    produits = array('I', par_produit.keys())
+    forces = array('H', par_produit.values())
+    couleurs = array('H', par_couleur)
+    if sys.byteorder != 'little':
+        for tableau in (produits, forces, couleurs):
+            tableau.byteswap()
+    
+    departages = bytearray(b'\xff' * (5 * len(evaluations)))
+    for i, (_, departage) in enumerate(evaluations):
+        departages[5 * i:5 * i + len(departage)] = bytes(departage)
+    charge = (produits.tobytes() + forces.tobytes() + couleurs.tobytes()
+              + bytes(evaluation[0] + 1 for evaluation in evaluations) + bytes(departages))
+    
+    return ENTETE_TABLES.pack(MAGIE_TABLES, VERSION_TABLES, 0, zlib.crc32(charge),
+                              len(produits), len(couleurs), len(evaluations)) + charge
+
+def _deserialiser_tables(donnees: Union[bytes, memoryview]) -> Tables:
+    # Sur une machine petit-boutiste, la table des couleurs reste une vue sur les
+    # données lues : des processus qui les partagent n'en gardent qu'une copie.
+    vue = memoryview(donnees)
+    if len(vue) < ENTETE_TABLES.size:
+        raise ValueError("cache de tables tronqué")
+    magie, version, _, somme, nombre_produits, nombre_couleurs, nombre_evaluations = ENTETE_TABLES.unpack_from(vue)
+    if magie != MAGIE_TABLES or version != VERSION_TABLES:
+        raise ValueError("cache de tables d'un autre format")
+    charge = vue[ENTETE_TABLES.size:]
+    if len(charge) != 6 * nombre_produits + 2 * nombre_couleurs + 6 * nombre_evaluations or zlib.crc32(charge) != somme:
+        raise ValueError("cache de tables corrompu")
+    
+    produits: Sequence[int] = charge[:4 * nombre_produits].cast('I')
+    debut = 4 * nombre_produits
+    forces: Sequence[int] = charge[debut:debut + 2 * nombre_produits].cast('H')
+    debut += 2 * nombre_produits
+    par_couleur: Sequence[int] = charge[debut:debut + 2 * nombre_couleurs].cast('H')
+    debut += 2 * nombre_couleurs
+    if sys.byteorder != 'little':
+        produits, forces, par_couleur = array('I', produits), array('H', forces), array('H', par_couleur)
+        for tableau in (produits, forces, par_couleur):
+            tableau.byteswap()
+    
+    categories = bytes(charge[debut:debut + nombre_evaluations])
+    departages = bytes(charge[debut + nombre_evaluations:])
+    # Chaque départage occupe 5 octets, complétés par 0xff.
+    evaluations: List[Evaluation] = [(categorie - 1, tuple(departages[5 * i:5 * i + 5].rstrip(b'\xff')))
+                                     for i, categorie in enumerate(categories)]
+    return dict(zip(produits, forces)), par_couleur, evaluations
+
+def sauvegarder_tables(chemin: str) -> None:
+    _assurer_tables()
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    with open(temporaire, 'wb') as fichier:
+        fichier.write(_serialiser_tables((_FORCE_PAR_PRODUIT, _FORCE_COULEUR, _EVALUATIONS)))
+    os.replace(temporaire, chemin)
+
+def charger_tables(chemin: str) -> Tables:
+    with open(chemin, 'rb') as fichier:
+        return _deserialiser_tables(fichier.read())
+
+def _installer_tables(tables: Tables) -> None:
+    global _FORCE_PAR_PRODUIT, _FORCE_COULEUR, _EVALUATIONS, _CATEGORIES, _tables_pretes, _force_cartes
+    par_produit, par_couleur, evaluations = tables
+    if len(evaluations) != NOMBRE_FORCES + 1:
+        raise ValueError("tables d'évaluation incomplètes")
+    
+    _FORCE_PAR_PRODUIT, _FORCE_COULEUR, _EVALUATIONS = par_produit, par_couleur, evaluations
+    _CATEGORIES = bytes(max(evaluation[0], 0) for evaluation in evaluations)
+    _tables_pretes = True
+    if _force_cartes is _force_cartes_initiale:
+        _force_cartes = _force_cartes_tables
+
+def _assurer_tables() -> None:
+    if _tables_pretes:
+        return
+    
+    chemin = os.environ.get(VARIABLE_CACHE_TABLES)
+    if chemin:
+        try:
+            _installer_tables(charger_tables(chemin))
+            return
+        except (OSError, ValueError):
+            pass
+    
+    _installer_tables(_construire_tables())
+    if chemin:
+        try:
+            sauvegarder_tables(chemin)
+        except OSError:
+            pass
+
+def __getattr__(nom: str) -> object:
+    if nom in ('_FORCE_PAR_PRODUIT', '_FORCE_COULEUR', '_EVALUATIONS', '_CATEGORIES'):
+        _assurer_tables()
+        return globals()[nom]
+    raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+
+def _force_cartes_tables(cartes: Sequence[Carte]) -> int:
+    c0, c1, c2, c3, c4 = cartes
+    if c0.indice_couleur == c1.indice_couleur == c2.indice_couleur == c3.indice_couleur == c4.indice_couleur:
+        return _FORCE_COULEUR[c0.bit | c1.bit | c2.bit | c3.bit | c4.bit]
+    return _FORCE_PAR_PRODUIT.get(c0.premier * c1.premier * c2.premier * c3.premier * c4.premier, 0)
+
+def _force_cartes_initiale(cartes: Sequence[Carte]) -> int:
+    _assurer_tables()
+    return _force_cartes_tables(cartes)
+
+_force_cartes: Callable[[Sequence[Carte]], int] = _force_cartes_initiale
+
+def installer_moteur_force(moteur: Optional[Callable[[Sequence[Carte]], int]]) -> None:
+    global _force_cartes
+    if moteur is None:
+        moteur = _force_cartes_tables if _tables_pretes else _force_cartes_initiale
+    _force_cartes = moteur
+    _cache_forces.clear()
+
+def force_cartes(cartes: Sequence[Carte]) -> int:
+    return _force_cartes(cartes)
+
+TAILLE_CACHE_FORCES: int = 1 << 16
+
+# Cache LRU commun à tout le processus, indexé par l'ensemble des cartes (masque
+# de 52 bits) : rejouer ou réanalyser les mêmes mains ne coûte qu'une recherche.
+_cache_forces: 'OrderedDict[int, int]' = OrderedDict()
+_taille_cache: List[int] = [TAILLE_CACHE_FORCES]
+_statistiques_cache: List[int] = [0, 0]
+
+def configurer_cache_forces(taille: int) -> None:
+    if taille < 0:
+        raise ValueError(f"Taille de cache non valide: {taille}")
+    _taille_cache[0] = taille
+    while len(_cache_forces) > taille:
+        _cache_forces.popitem(last=False)
+
+def vider_cache_forces() -> None:
+    _cache_forces.clear()
+    _statistiques_cache[:] = [0, 0]
+
+def statistiques_cache_forces() -> Dict[str, int]:
+    return {'succes': _statistiques_cache[0], 'echecs': _statistiques_cache[1],
+            'taille': len(_cache_forces), 'taille_max': _taille_cache[0]}
+
+class EtatMain:
+    __slots__ = ('cartes', 'comptes_rangs', 'comptes_couleurs', 'masque_rangs', 'masque', 'produit')
+    
+    def __init__(self, cartes: Sequence[Carte]) -> None:
+        if len(cartes) != 5:
+            raise ValueError("Une main doit contenir exactement 5 cartes")
+        
+        if not _tables_pretes:
+            _assurer_tables()
+        
+        self.cartes: List[Carte] = list(cartes)
+        self.comptes_rangs: List[int] = [0] * 13
+        self.comptes_couleurs: List[int] = [0] * 4
+        self.masque_rangs: int = 0
+        self.masque: int = 0
+        self.produit: int = 1
+        for carte in cartes:
+            self.comptes_rangs[carte.valeur] += 1
+            self.comptes_couleurs[carte.indice_couleur] += 1
+            self.masque_rangs |= carte.bit
+            self.masque |= carte.masque
+            self.produit *= carte.premier
+    
+    def copier(self) -> 'EtatMain':
+        copie = EtatMain.__new__(EtatMain)
+        copie.cartes = list(self.cartes)
+        copie.comptes_rangs = list(self.comptes_rangs)
+        copie.comptes_couleurs = list(self.comptes_couleurs)
+        copie.masque_rangs = self.masque_rangs
+        copie.masque = self.masque
+        copie.produit = self.produit
+        return copie
+    
+    def remplacer(self, indice: int, carte: Carte) -> None:
+        ancienne = self.cartes[indice]
+        self.cartes[indice] = carte
+        
+        self.comptes_rangs[ancienne.valeur] -= 1
+        if not self.comptes_rangs[ancienne.valeur]:
+            self.masque_rangs &= ~ancienne.bit
+        self.comptes_rangs[carte.valeur] += 1
+        self.masque_rangs |= carte.bit
+        
+        self.comptes_couleurs[ancienne.indice_couleur] -= 1
+        self.comptes_couleurs[carte.indice_couleur] += 1
+        self.masque = (self.masque & ~ancienne.masque) | carte.masque
+        self.produit = self.produit // ancienne.premier * carte.premier
+    
+    def echanger(self, remplacements: Dict[int, Carte]) -> None:
+        for indice, carte in remplacements.items():
+            self.remplacer(indice, carte)
+    
+    def force(self) -> int:
+        if 5 in self.comptes_couleurs:
+            return _FORCE_COULEUR[self.masque_rangs]
+        return _FORCE_PAR_PRODUIT.get(self.produit, 0)
+    
+    def force_si(self, remplacements: Dict[int, Carte]) -> int:
+        produit = self.produit
+        couleurs = list(self.comptes_couleurs)
+        for indice, carte in remplacements.items():
+            ancienne = self.cartes[indice]
+            produit = produit // ancienne.premier * carte.premier
+            couleurs[ancienne.indice_couleur] -= 1
+            couleurs[carte.indice_couleur] += 1
+        
+        if 5 in couleurs:
+            masque_rangs = 0
+            for indice, carte in enumerate(self.cartes):
+                masque_rangs |= remplacements.get(indice, carte).bit
+            return _FORCE_COULEUR[masque_rangs]
+        return _FORCE_PAR_PRODUIT.get(produit, 0)
+    
+    def evaluateur_remplacement(self, indices: Sequence[int]) -> Callable[[Sequence[Carte]], int]:
+        return evaluateur_tirage([carte for i, carte in enumerate(self.cartes) if i not in indices])
+    
+    def main(self) -> Main:
+        return Main(self.cartes)
+
+def evaluateur_tirage(gardees: Sequence[Carte]) -> Callable[[Sequence[Carte]], int]:
+    _assurer_tables()
+    produit_gardees = 1
+    bits_gardees = 0
+    for carte in gardees:
+        produit_gardees *= carte.premier
+        bits_gardees |= carte.bit
+    couleurs = {carte.indice_couleur for carte in gardees}
+    par_produit = _FORCE_PAR_PRODUIT
+    par_couleur = _FORCE_COULEUR
+    
+    # Le produit des cartes gardées est calculé une fois : chaque tirage ne coûte
+    # plus qu'une multiplication par carte tirée, et le test de couleur disparaît
+    # dès que les cartes gardées sont de couleurs différentes.
+    if len(couleurs) > 1:
+        def evaluer(tirage: Sequence[Carte]) -> int:
+            produit = produit_gardees
+            for carte in tirage:
+                produit *= carte.premier
+            return par_produit.get(produit, 0)
+        return evaluer
+    
+    couleur_gardees = couleurs.pop() if couleurs else -1
+    
+    def evaluer_avec_couleur(tirage: Sequence[Carte]) -> int:
+        produit = produit_gardees
+        bits = bits_gardees
+        couleur = couleur_gardees
+        meme_couleur = True
+        for carte in tirage:
+            produit *= carte.premier
+            bits |= carte.bit
+            if couleur < 0:
+                couleur = carte.indice_couleur
+            elif carte.indice_couleur != couleur:
+                meme_couleur = False
+        if meme_couleur:
+            return par_couleur[bits]
+        return par_produit.get(produit, 0)
+    return evaluer_avec_couleur
+
+def categorie_force(force: int) -> int:
+    if not 1 <= force <= NOMBRE_FORCES:
+        raise ValueError(f"Force non valide: {force}")
+    if not _tables_pretes:
+        _assurer_tables()
+    return _CATEGORIES[force]
+
+def evaluation_force(force: int) -> Tuple[int, List[int]]:
+    if not 1 <= force <= NOMBRE_FORCES:
+        raise ValueError(f"Force non valide: {force}")
+    _assurer_tables()
+    categorie, departage = _EVALUATIONS[force]
+    return (categorie, list(departage))
+
+def _comparer_evaluations(eval1: Tuple[int, List[int]], eval2: Tuple[int, List[int]]) -> int:
     if eval1[0] > eval2[0]:
         return 1
     elif eval1[0] < eval2[0]:
@@ -135,6 +640,184 @@ def comparer_mains(main1: Main, main2: Main) -> int:
     
     return 0
 
+def comparer_mains(main1: Main, main2: Main) -> int:
+    force1 = main1.force()
+    force2 = main2.force()
+    
+    if force1 and force2:
+        return (force1 > force2) - (force1 < force2)
+    
+    return _comparer_evaluations(main1.evaluer(), main2.evaluer())
+
+class Abattage(NamedTuple):
+    forces: List[int]
+    rangs: List[int]
+    gagnants: List[int]
+
+def classer_mains(mains: Sequence[Main]) -> Abattage:
+    if not mains:
+        raise ValueError("aucune main à classer")
+    
+    forces = [_force_cartes(main.cartes) for main in mains]
+    cles: List[object] = forces
+    if not all(forces):
+        cles = [(categorie, tuple(departage)) for categorie, departage in (main.evaluer() for main in mains)]
+    
+    # Le rang d'un siège vaut 1 + le nombre de mains strictement plus fortes :
+    # un seul tri suffit, les égalités partagent le même rang.
+    croissantes = sorted(cles)
+    borne = len(cles) + 1
+    rangs = [borne - bisect_right(croissantes, cle) for cle in cles]
+    meilleure = croissantes[-1]
+    return Abattage(forces, rangs, [siege for siege, cle in enumerate(cles) if cle == meilleure])
+
+def classer_tables(tables: Sequence[Sequence[Main]]) -> List[Abattage]:
+    return [classer_mains(mains) for mains in tables]
+
+_QUINTES: List[int] = [0b11111 << (haut - 4) for haut in range(12, 3, -1)] + [0b1000000001111]
+
+def _meilleure_quinte(masque: int) -> int:
+    for quinte in _QUINTES:
+        if masque & quinte == quinte:
+            return quinte
+    return 0
+
+def _choisir_rangs(comptes: List[int], masque: int) -> List[int]:
+    groupes = sorted(((compte, valeur) for valeur, compte in enumerate(comptes) if compte), reverse=True)
+    compte_haut, valeur_haute = groupes[0]
+    
+    if compte_haut == 4:
+        return [valeur_haute] * 4 + [max(valeur for _, valeur in groupes[1:])]
+    
+    if compte_haut == 3 and groupes[1][0] >= 2:
+        paire = max(valeur for compte, valeur in groupes[1:] if compte >= 2)
+        return [valeur_haute] * 3 + [paire] * 2
+    
+    quinte = _meilleure_quinte(masque)
+    if quinte:
+        return [valeur for valeur in range(13) if quinte >> valeur & 1]
+    
+    if compte_haut == 3:
+        return [valeur_haute] * 3 + sorted((valeur for _, valeur in groupes[1:]), reverse=True)[:2]
+    
+    if compte_haut == 2 and groupes[1][0] == 2:
+        paire_basse = groupes[1][1]
+        return [valeur_haute] * 2 + [paire_basse] * 2 + [max(valeur for _, valeur in groupes[2:])]
+    
+    if compte_haut == 2:
+        return [valeur_haute] * 2 + [valeur for _, valeur in groupes[1:4]]
+    
+    return [valeur for _, valeur in groupes[:5]]
+
+def _analyser_meilleure_main(cartes: Sequence[Carte]) -> Tuple[int, int, List[int]]:
+    if not 5 <= len(cartes) <= 7:
+        raise ValueError("Il faut entre 5 et 7 cartes pour chercher la meilleure main")
+    if len(set(cartes)) != len(cartes):
+        raise ValueError("Les cartes doivent être distinctes")
+    _assurer_tables()
+    
+    comptes: List[int] = [0] * 13
+    masques_couleur: List[int] = [0, 0, 0, 0]
+    for carte in cartes:
+        comptes[carte.valeur] += 1
+        masques_couleur[carte.indice_couleur] |= carte.bit
+    
+    for couleur, masque in enumerate(masques_couleur):
+        if masque.bit_count() >= 5:
+            choix = _meilleure_quinte(masque)
+            if not choix:
+                choix = masque
+                while choix.bit_count() > 5:
+                    choix &= choix - 1
+            return _FORCE_COULEUR[choix], couleur, [valeur for valeur in range(13) if choix >> valeur & 1]
+    
+    rangs = _choisir_rangs(comptes, masques_couleur[0] | masques_couleur[1] | masques_couleur[2] | masques_couleur[3])
+    produit = 1
+    for valeur in rangs:
+        produit *= PREMIERS[valeur]
+    return _FORCE_PAR_PRODUIT[produit], -1, rangs
+
+def force_meilleure_main(cartes: Sequence[Carte]) -> int:
+    return _analyser_meilleure_main(cartes)[0]
+
+def meilleure_main(cartes: Sequence[Carte]) -> Main:
+    _, couleur, rangs = _analyser_meilleure_main(cartes)
+    
+    restants: List[int] = [0] * 13
+    for valeur in rangs:
+        restants[valeur] += 1
+    
+    choisies: List[Carte] = []
+    for carte in cartes:
+        if restants[carte.valeur] and (couleur < 0 or carte.indice_couleur == couleur):
+            restants[carte.valeur] -= 1
+            choisies.append(carte)
+    
+    return Main(choisies)
+
+def canoniser(cartes: Sequence[Carte], mortes: Sequence[Carte] = ()) -> Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]:
+    signatures: List[List[int]] = [[0, 0], [0, 0], [0, 0], [0, 0]]
+    for carte in cartes:
+        signatures[carte.indice_couleur][0] |= carte.bit
+    for carte in mortes:
+        signatures[carte.indice_couleur][1] |= carte.bit
+    
+    permutation: List[int] = [0, 0, 0, 0]
+    for nouvelle, ancienne in enumerate(sorted(range(4), key=signatures.__getitem__, reverse=True)):
+        permutation[ancienne] = nouvelle
+    
+    return (tuple(sorted(carte.valeur << 2 | permutation[carte.indice_couleur] for carte in cartes)),
+            tuple(sorted(carte.valeur << 2 | permutation[carte.indice_couleur] for carte in mortes)),
+            tuple(permutation))
+
+NOMBRE_CLASSES_ISOMORPHES: int = 134459
+
+_cles_isomorphes: Optional['array[int]'] = None
+
+def _construire_cles_isomorphes() -> 'array[int]':
+    masques_par_taille: List[List[int]] = [[] for _ in range(6)]
+    for masque in range(1 << 13):
+        if masque.bit_count() <= 5:
+            masques_par_taille[masque.bit_count()].append(masque)
+    
+    cles: List[int] = []
+    
+    def parcourir(restantes: int, borne: int, profondeur: int, cle: int) -> None:
+        if profondeur == 3:
+            for masque in masques_par_taille[restantes]:
+                if masque > borne:
+                    break
+                cles.append(cle << 13 | masque)
+            return
+        
+        for taille in range(restantes + 1):
+            for masque in masques_par_taille[taille]:
+                if masque > borne:
+                    break
+                parcourir(restantes - taille, masque, profondeur + 1, cle << 13 | masque)
+    
+    parcourir(5, (1 << 13) - 1, 0, 0)
+    cles.sort()
+    return array('Q', cles)
+
+def indice_isomorphe(cartes: Sequence[Carte]) -> int:
+    global _cles_isomorphes
+    if len(cartes) != 5:
+        raise ValueError("Une main doit contenir exactement 5 cartes")
+    if _cles_isomorphes is None:
+        _cles_isomorphes = _construire_cles_isomorphes()
+    
+    masques: List[int] = [0, 0, 0, 0]
+    for carte in cartes:
+        masques[carte.indice_couleur] |= carte.bit
+    m0, m1, m2, m3 = sorted(masques, reverse=True)
+    cle = m0 << 39 | m1 << 26 | m2 << 13 | m3
+    
+    indice = bisect_left(_cles_isomorphes, cle)
+    if indice == len(_cles_isomorphes) or _cles_isomorphes[indice] != cle:
+        raise ValueError("Les cartes doivent être distinctes")
+    return indice
+
 def nom_combinaison(rang: int) -> str:
     noms: Dict[int, str] = {
         0: "Carte Haute",
@@ -151,7 +834,7 @@ def nom_combinaison(rang: int) -> str:
     return noms.get(rang, "Inconnu")
 
 if __name__ == "__main__":
-    jeu: List[Carte] = [Carte(rang, couleur) for couleur in COULEURS for rang in RANGS]
+    jeu: List[Carte] = list(JEU_ORDONNE)
     
     quinte_flush_royale: Main = Main([
         Carte('As', 'Coeur'),
@@ -170,10 +853,10 @@ if __name__ == "__main__":
     ])
     
     print(f"Quinte Flush Royale: {quinte_flush_royale}")
-    print(f"Type: {nom_combinaison(quinte_flush_royale.evaluer()[0])}")
+    print(f"Type: {nom_combinaison(quinte_flush_royale.categorie())}")
     
     print(f"Carré: {carre}")
-    print(f"Type: {nom_combinaison(carre.evaluer()[0])}")
+    print(f"Type: {nom_combinaison(carre.categorie())}")
     
     resultat: int = comparer_mains(quinte_flush_royale, carre)
     if resultat > 0:
@@ -0,0 +1,201 @@
+import argparse
+import json
+from itertools import combinations_with_replacement
+from math import comb
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import poker
+from jeu_poker import parser_carte
+from moteur_echange import PROBA_VICTOIRE
+from poker import Carte, Main, PREMIERS, canoniser, nom_combinaison
+
+VERSION: int = 1
+
+class DistributionTirage(NamedTuple):
+    comptes: Tuple[int, ...]
+    total: int
+    somme_forces: int
+    somme_victoires: float
+    
+    @property
+    def probabilites(self) -> Dict[str, float]:
+        return {nom_combinaison(categorie): nombre / self.total for categorie, nombre in enumerate(self.comptes)}
+    
+    @property
+    def esperance_force(self) -> float:
+        return self.somme_forces / self.total
+    
+    @property
+    def esperance_victoire(self) -> float:
+        return self.somme_victoires / self.total
+
+Cle = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+Forme = Tuple[Tuple[Tuple[int, int], ...], int, Optional[int]]
+
+def _construire_multiensembles() -> List[List[Forme]]:
+    multiensembles: List[List[Forme]] = []
+    for tirees in range(6):
+        formes: List[Forme] = []
+        for rangs in combinations_with_replacement(range(13), tirees):
+            multiplicites = tuple((rang, rangs.count(rang)) for rang in sorted(set(rangs)))
+            produit = 1
+            for rang in rangs:
+                produit *= PREMIERS[rang]
+            masque = sum(1 << rang for rang in rangs) if len(set(rangs)) == tirees else None
+            formes.append((multiplicites, produit, masque))
+        multiensembles.append(formes)
+    return multiensembles
+
+# Pour chaque nombre de cartes tirées, les multiensembles de rangs possibles avec
+# leurs multiplicités, le produit de leurs nombres premiers et leur masque de
+# rangs (None dès qu'un rang se répète : aucune couleur n'est alors possible).
+# Un tirage se compte alors par rangs, et non carte par carte.
+_MULTIENSEMBLES: List[List[Forme]] = _construire_multiensembles()
+
+_memo: Dict[Cle, DistributionTirage] = {}
+_statistiques: List[int] = [0, 0]
+
+def _calculer(gardees: Sequence[int], mortes: Sequence[int]) -> DistributionTirage:
+    connues = set(gardees) | set(mortes)
+    disponibles = [4] * 13
+    for code in connues:
+        disponibles[code >> 2] -= 1
+    
+    produit_gardees = 1
+    masque_gardees = 0
+    for code in gardees:
+        produit_gardees *= PREMIERS[code >> 2]
+        masque_gardees |= 1 << (code >> 2)
+    couleurs: Iterable[int] = {code & 3 for code in gardees} or range(4)
+    couleur_possible = len(set(couleurs)) == 1 or not gardees
+    rangs_distincts = bin(masque_gardees).count('1') == len(gardees)
+    
+    par_produit = poker._FORCE_PAR_PRODUIT
+    par_couleur = poker._FORCE_COULEUR
+    categories = poker._CATEGORIES
+    comptes = [0] * 10
+    total = somme_forces = 0
+    somme_victoires = 0.0
+    
+    for multiplicites, produit, masque in _MULTIENSEMBLES[5 - len(gardees)]:
+        facons = 1
+        for rang, nombre in multiplicites:
+            facons *= comb(disponibles[rang], nombre)
+        if not facons:
+            continue
+        
+        en_couleur = 0
+        if couleur_possible and rangs_distincts and masque is not None and not masque & masque_gardees:
+            for couleur in couleurs:
+                if all((rang << 2 | couleur) not in connues for rang, _ in multiplicites):
+                    en_couleur += 1
+            if en_couleur:
+                force = par_couleur[masque | masque_gardees]
+                comptes[categories[force]] += en_couleur
+                somme_forces += force * en_couleur
+                somme_victoires += PROBA_VICTOIRE[force] * en_couleur
+        
+        force = par_produit[produit * produit_gardees]
+        autres = facons - en_couleur
+        comptes[categories[force]] += autres
+        somme_forces += force * autres
+        somme_victoires += PROBA_VICTOIRE[force] * autres
+        total += facons
+    
+    return DistributionTirage(tuple(comptes), total, somme_forces, somme_victoires)
+
+def distribution_gardees(gardees: Sequence[Carte], mortes: Sequence[Carte] = ()) -> DistributionTirage:
+    if len(gardees) > 5:
+        raise ValueError("on ne peut garder que 5 cartes au plus")
+    if len(set(gardees) | set(mortes)) != len(gardees) + len(mortes):
+        raise ValueError("une carte apparaît plusieurs fois")
+    
+    gardees_canon, mortes_canon, _ = canoniser(gardees, mortes)
+    cle = (gardees_canon, mortes_canon)
+    distribution = _memo.get(cle)
+    if distribution is None:
+        _statistiques[1] += 1
+        distribution = _memo[cle] = _calculer(gardees_canon, mortes_canon)
+    else:
+        _statistiques[0] += 1
+    return distribution
+
+def distribution_tirage(main: Main, gardees: Sequence[int]) -> DistributionTirage:
+    indices = set(gardees)
+    if not indices <= set(range(5)):
+        raise ValueError(f"indices de cartes non valides: {sorted(gardees)}")
+    return distribution_gardees([carte for i, carte in enumerate(main.cartes) if i in indices],
+                                [carte for i, carte in enumerate(main.cartes) if i not in indices])
+
+def meilleur_choix(main: Main) -> Tuple[List[int], DistributionTirage]:
+    choix: List[Tuple[float, List[int], DistributionTirage]] = []
+    for masque in range(32):
+        gardees = [i for i in range(5) if masque >> i & 1]
+        distribution = distribution_tirage(main, gardees)
+        choix.append((distribution.esperance_victoire, gardees, distribution))
+    _, gardees, distribution = max(choix, key=lambda element: (element[0], len(element[1])))
+    return gardees, distribution
+
+def choisir_echange(main: Main) -> List[int]:
+    gardees, _ = meilleur_choix(main)
+    return [i for i in range(5) if i not in gardees]
+
+def precalculer(mains: Iterable[Main]) -> int:
+    avant = len(_memo)
+    for main in mains:
+        for masque in range(32):
+            distribution_tirage(main, [i for i in range(5) if masque >> i & 1])
+    return len(_memo) - avant
+
+def sauvegarder(chemin: str) -> None:
+    document = {
+        'version': VERSION,
+        'entrees': [[list(gardees), list(mortes), list(distribution.comptes), distribution.total,
+                     distribution.somme_forces, distribution.somme_victoires]
+                    for (gardees, mortes), distribution in _memo.items()],
+    }
+    with open(chemin, 'w', encoding='utf-8') as fichier:
+        json.dump(document, fichier)
+
+def charger(chemin: str) -> int:
+    with open(chemin, encoding='utf-8') as fichier:
+        document = json.load(fichier)
+    if document.get('version') != VERSION:
+        raise ValueError("table de probabilités d'une autre version")
+    
+    for gardees, mortes, comptes, total, somme_forces, somme_victoires in document['entrees']:
+        _memo[(tuple(gardees), tuple(mortes))] = DistributionTirage(tuple(comptes), total, somme_forces, somme_victoires)
+    return len(document['entrees'])
+
+def vider() -> None:
+    _memo.clear()
+    _statistiques[:] = [0, 0]
+
+def statistiques_cache() -> Dict[str, int]:
+    return {'succes': _statistiques[0], 'echecs': _statistiques[1], 'taille': len(_memo)}
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Probabilités exactes des combinaisons après échange")
+    analyseur.add_argument('cartes', nargs=5, help="les 5 cartes de la main (ex: AC RC 7P 7T 2K)")
+    analyseur.add_argument('--garder', type=int, nargs='*', help="indices des cartes gardées (0 à 4)")
+    arguments = analyseur.parse_args()
+    
+    main_initiale = Main([Carte(*parser_carte(texte)) for texte in arguments.cartes])
+    cartes = [Carte(*parser_carte(texte)) for texte in arguments.cartes]
+    if arguments.garder is None:
+        gardees, distribution = meilleur_choix(main_initiale)
+        gardees = [cartes.index(main_initiale.cartes[i]) for i in gardees]
+    else:
+        gardees = arguments.garder
+        distribution = distribution_gardees([cartes[i] for i in gardees],
+                                            [carte for i, carte in enumerate(cartes) if i not in gardees])
+    
+    print(f"cartes gardées: {' '.join(str(cartes[i]) for i in gardees) or 'aucune'}")
+    for nom, probabilite in distribution.probabilites.items():
+        print(f"{nom:<22} {probabilite:>9.4%}")
+    print(f"force moyenne: {distribution.esperance_force:.1f}")
+    print(f"probabilité de battre une main au hasard: {distribution.esperance_victoire:.4f}")
+
+if __name__ == "__main__":
+    main()
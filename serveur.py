@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import random
+from concurrent.futures import Executor
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Union
+
+from format_binaire import texte_main
+from jeu_poker import JeuPoker, StrategieEchange, indices_echange_heuristique, parser_carte
+from paquet import PaquetMasque
+from parties_auto import resoudre_strategie, strategie_aucun_echange
+from poker import Carte
+from tables_partagees import executeur_partage
+
+LONGUEUR_LIGNE_MAX: int = 1024
+TABLES_MAX: int = 100_000
+
+# Ces stratégies répondent en quelques microsecondes : un aller-retour par
+# l'exécuteur coûterait plus cher que de les appeler dans la boucle.
+STRATEGIES_LEGERES = (strategie_aucun_echange, indices_echange_heuristique)
+
+class ServeurPoker:
+    def __init__(self, strategie_ordi: Union[str, StrategieEchange] = 'heuristique',
+                 executeur: Optional[Executor] = None, tables_max: int = TABLES_MAX,
+                 graine: Optional[int] = None) -> None:
+        self.strategie_ordi: StrategieEchange = resoudre_strategie(strategie_ordi)
+        self.executeur: Optional[Executor] = executeur
+        self.deporter: bool = executeur is not None or self.strategie_ordi not in STRATEGIES_LEGERES
+        self.tables_max: int = tables_max
+        self.tables_ouvertes: int = 0
+        self.parties_jouees: int = 0
+        self.connexions: int = 0
+        self._generateur = random.Random(graine)
+        self._prochain_identifiant: int = 1
+    
+    async def demarrer(self, hote: str = '127.0.0.1', port: int = 0,
+                       chemin_unix: Optional[str] = None) -> asyncio.AbstractServer:
+        if chemin_unix is not None:
+            return await asyncio.start_unix_server(self._servir, chemin_unix, limit=LONGUEUR_LIGNE_MAX)
+        return await asyncio.start_server(self._servir, hote, port, limit=LONGUEUR_LIGNE_MAX)
+    
+    async def _servir(self, lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter) -> None:
+        tables: Dict[int, JeuPoker] = {}
+        self.connexions += 1
+        try:
+            while True:
+                try:
+                    ligne = await lecteur.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    ecrivain.write("ERREUR ligne trop longue\n".encode('utf-8'))
+                    break
+                if not ligne:
+                    break
+                
+                commande = ligne.decode('utf-8', errors='replace').strip()
+                if not commande:
+                    continue
+                if commande.upper() == 'QUITTER':
+                    ecrivain.write(b"AU REVOIR\n")
+                    break
+                
+                try:
+                    reponse = await self.traiter_commande(tables, commande)
+                except ValueError as e:
+                    reponse = f"ERREUR {e}"
+                ecrivain.write((reponse + "\n").encode('utf-8'))
+                await ecrivain.drain()
+            await ecrivain.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.tables_ouvertes -= len(tables)
+            self.connexions -= 1
+            ecrivain.close()
+    
+    def _ouvrir_table(self, tables: Dict[int, JeuPoker]) -> int:
+        if self.tables_ouvertes >= self.tables_max:
+            raise ValueError("trop de tables ouvertes")
+        
+        identifiant = self._prochain_identifiant
+        self._prochain_identifiant += 1
+        tables[identifiant] = JeuPoker(strategie_ordi=self.strategie_ordi, paquet=PaquetMasque(self._generateur))
+        self.tables_ouvertes += 1
+        return identifiant
+    
+    async def traiter_commande(self, tables: Dict[int, JeuPoker], commande: str) -> str:
+        mots = commande.split()
+        verbe = mots[0].upper()
+        
+        if verbe == 'NOUVELLE':
+            identifiant = self._ouvrir_table(tables) if len(mots) == 1 else self._identifiant(tables, mots)
+            tables[identifiant].nouvelle_partie()
+            return f"TABLE {identifiant}"
+        if verbe == 'STATS':
+            return (f"STATS tables={self.tables_ouvertes} parties={self.parties_jouees} "
+                    f"connexions={self.connexions}")
+        
+        identifiant = self._identifiant(tables, mots)
+        jeu = tables[identifiant]
+        
+        if verbe == 'FERMER':
+            del tables[identifiant]
+            self.tables_ouvertes -= 1
+            return f"FERMEE {identifiant}"
+        
+        if jeu.main_ordi is None:
+            raise ValueError("aucune partie en cours, envoyez NOUVELLE")
+        
+        if verbe == 'DISTRIBUER':
+            jeu.main_joueur = jeu.distribuer_main()
+        elif verbe == 'MAIN':
+            cartes: List[Carte] = [Carte(*parser_carte(texte)) for texte in mots[2:]]
+            jeu.definir_main_joueur(cartes)
+        elif verbe == 'ECHANGER':
+            if jeu.main_joueur is None:
+                raise ValueError("aucune main joueur")
+            try:
+                indices = [int(mot) for mot in mots[2:]]
+            except ValueError:
+                raise ValueError("indices d'échange non valides")
+            self._verifier_paquet(jeu, indices)
+            jeu.echanger_cartes_joueur(indices)
+        elif verbe == 'ABATTRE':
+            if jeu.main_joueur is None:
+                raise ValueError("aucune main joueur")
+            return await self._abattre(identifiant, jeu)
+        else:
+            raise ValueError(f"commande inconnue: {verbe}")
+        
+        return f"MAIN {identifiant} {texte_main(jeu.main_joueur.cartes)}"
+    
+    def _identifiant(self, tables: Dict[int, JeuPoker], mots: List[str]) -> int:
+        try:
+            identifiant = int(mots[1])
+        except (IndexError, ValueError):
+            raise ValueError("identifiant de table attendu")
+        if identifiant not in tables:
+            raise ValueError(f"table inconnue: {identifiant}")
+        return identifiant
+    
+    def _verifier_paquet(self, jeu: JeuPoker, indices: List[int]) -> None:
+        if len({i for i in indices if 0 <= i < 5}) > len(jeu.jeu):
+            raise ValueError("plus assez de cartes dans le jeu pour cet échange")
+    
+    async def _abattre(self, identifiant: int, jeu: JeuPoker) -> str:
+        main_ordi = jeu.main_ordi
+        if self.deporter:
+            indices = await asyncio.get_running_loop().run_in_executor(self.executeur, self.strategie_ordi, main_ordi)
+        else:
+            indices = self.strategie_ordi(main_ordi)
+        self._verifier_paquet(jeu, indices)
+        jeu.echanger_cartes_ordi(indices)
+        gagnant = jeu.determiner_gagnant()
+        
+        self.parties_jouees += 1
+        resultat = (f"RESULTAT {identifiant} {gagnant} {texte_main(jeu.main_joueur.cartes)} / "
+                    f"{texte_main(jeu.main_ordi.cartes)}")
+        jeu.main_ordi = jeu.main_joueur = None
+        return resultat
+
+async def servir(hote: str, port: int, chemin_unix: Optional[str], strategie: str, processus: int) -> None:
+    with ExitStack() as pile:
+        executeur = pile.enter_context(executeur_partage(processus)) if processus > 1 else None
+        serveur = ServeurPoker(strategie, executeur)
+        async with await serveur.demarrer(hote, port, chemin_unix) as ecoute:
+            adresses = ", ".join(str(socket.getsockname()) for socket in ecoute.sockets)
+            print(f"serveur de poker à l'écoute sur {adresses}")
+            await ecoute.serve_forever()
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Serveur de poker multi-tables")
+    analyseur.add_argument('--hote', default='127.0.0.1')
+    analyseur.add_argument('--port', type=int, default=7000)
+    analyseur.add_argument('--unix', help="chemin d'un socket Unix à la place de TCP")
+    analyseur.add_argument('--strategie', default='heuristique', help="stratégie de l'ordinateur")
+    analyseur.add_argument('--processus', type=int, default=1, help="processus pour les échanges de l'ordinateur")
+    arguments = analyseur.parse_args()
+    
+    try:
+        asyncio.run(servir(arguments.hote, arguments.port, arguments.unix, arguments.strategie, arguments.processus))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import math
+import random
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, List, NamedTuple, Optional, Sequence, Tuple
+
+from poker import Carte, Main, CARTES
+from jeu_poker import parser_carte
+from tables_partagees import executeur_partage
+
+TAILLE_BLOC: int = 2000
+
+class ResultatEquite(NamedTuple):
+    victoires: int
+    egalites: int
+    defaites: int
+    # Somme des parts de pot gagnées sur les égalités (1/2 à deux, 1/3 à trois...)
+    # et de leurs carrés. Absentes, chaque égalité compte pour un partage à deux.
+    parts_egalites: Optional[float] = None
+    parts_carrees: Optional[float] = None
+    
+    @property
+    def essais(self) -> int:
+        return self.victoires + self.egalites + self.defaites
+    
+    def _parts(self) -> Tuple[float, float]:
+        if self.parts_egalites is None or self.parts_carrees is None:
+            return self.egalites / 2, self.egalites / 4
+        return self.parts_egalites, self.parts_carrees
+    
+    @property
+    def equite(self) -> float:
+        if not self.essais:
+            return 0.0
+        return (self.victoires + self._parts()[0]) / self.essais
+    
+    @property
+    def erreur_type(self) -> float:
+        if self.essais < 2:
+            return math.inf
+        moyenne = self.equite
+        carres = (self.victoires + self._parts()[1]) / self.essais
+        return math.sqrt(max(carres - moyenne * moyenne, 0.0) / (self.essais - 1))
+    
+    def __add__(self, autre: object) -> 'ResultatEquite':
+        if not isinstance(autre, ResultatEquite):
+            return NotImplemented
+        parts, carrees = self._parts()
+        parts_autre, carrees_autre = autre._parts()
+        return ResultatEquite(self.victoires + autre.victoires,
+                              self.egalites + autre.egalites,
+                              self.defaites + autre.defaites,
+                              parts + parts_autre, carrees + carrees_autre)
+
+def _simuler_bloc(connues: Tuple[int, ...], mortes: Tuple[int, ...], adversaires: int,
+                  essais: int, graine: int, bloc: int) -> ResultatEquite:
+    generateur = random.Random(f"{graine}:{bloc}")
+    exclues = set(connues) | set(mortes)
+    restantes: List[Carte] = [carte for carte in CARTES if carte.code not in exclues]
+    main_connue: List[Carte] = [CARTES[code] for code in connues]
+    manquantes = 5 - len(main_connue)
+    besoin = manquantes + 5 * adversaires
+    
+    victoires = egalites = defaites = 0
+    parts = carrees = 0.0
+    for _ in range(essais):
+        tirage = generateur.sample(restantes, besoin)
+        force = Main(main_connue + tirage[:manquantes]).force()
+        
+        meilleure_adverse = 0
+        ex_aequo = 0
+        for debut in range(manquantes, besoin, 5):
+            force_adverse = Main(tirage[debut:debut + 5]).force()
+            if force_adverse > meilleure_adverse:
+                meilleure_adverse = force_adverse
+                ex_aequo = 1
+            elif force_adverse == meilleure_adverse:
+                ex_aequo += 1
+        
+        if force > meilleure_adverse:
+            victoires += 1
+        elif force == meilleure_adverse:
+            egalites += 1
+            part = 1 / (1 + ex_aequo)
+            parts += part
+            carrees += part * part
+        else:
+            defaites += 1
+    
+    return ResultatEquite(victoires, egalites, defaites, parts, carrees)
+
+def estimer_equite(cartes: Sequence[Carte], adversaires: int = 1, essais: int = 100_000,
+                   mortes: Sequence[Carte] = (), graine: int = 0, processus: int = 1,
+                   erreur_cible: Optional[float] = None, budget_secondes: Optional[float] = None,
+                   taille_bloc: int = TAILLE_BLOC) -> ResultatEquite:
+    if len(cartes) > 5:
+        raise ValueError("une main contient au plus 5 cartes")
+    if len(set(cartes) | set(mortes)) != len(cartes) + len(mortes):
+        raise ValueError("les cartes connues et mortes doivent être distinctes")
+    if adversaires < 1 or 5 * (adversaires + 1) + len(mortes) > 52:
+        raise ValueError(f"nombre d'adversaires non valide: {adversaires}")
+    
+    connues = tuple(carte.code for carte in cartes)
+    codes_mortes = tuple(carte.code for carte in mortes)
+    tailles: List[int] = [min(taille_bloc, essais - debut) for debut in range(0, essais, taille_bloc)]
+    taches = ((connues, codes_mortes, adversaires, taille, graine, bloc) for bloc, taille in enumerate(tailles))
+    
+    debut_chrono = time.perf_counter()
+    resultat = ResultatEquite(0, 0, 0)
+    
+    def arreter() -> bool:
+        if erreur_cible is not None and resultat.erreur_type <= erreur_cible:
+            return True
+        return budget_secondes is not None and time.perf_counter() - debut_chrono >= budget_secondes
+    
+    if processus <= 1:
+        for tache in taches:
+            resultat += _simuler_bloc(*tache)
+            if arreter():
+                break
+        return resultat
+    
+    # Les blocs sont cumulés dans leur ordre de numérotation : avec une erreur cible,
+    # le résultat ne dépend que de la graine, pas du nombre de processus.
+    with executeur_partage(processus) as executeur:
+        en_cours: Deque['Future[ResultatEquite]'] = deque()
+        for tache in taches:
+            en_cours.append(executeur.submit(_simuler_bloc, *tache))
+            if len(en_cours) < 2 * processus:
+                continue
+            resultat += en_cours.popleft().result()
+            if arreter():
+                break
+        else:
+            while en_cours:
+                resultat += en_cours.popleft().result()
+                if arreter():
+                    break
+        
+        for futur in en_cours:
+            futur.cancel()
+    
+    return resultat
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Estimation de l'équité d'une main par Monte Carlo")
+    analyseur.add_argument('cartes', nargs='*', help="cartes connues (ex: AC RC)")
+    analyseur.add_argument('--adversaires', type=int, default=1)
+    analyseur.add_argument('--essais', type=int, default=100_000)
+    analyseur.add_argument('--graine', type=int, default=0)
+    analyseur.add_argument('--processus', type=int, default=1)
+    analyseur.add_argument('--erreur-cible', type=float)
+    analyseur.add_argument('--budget', type=float, help="budget en secondes")
+    arguments = analyseur.parse_args()
+    
+    cartes = [Carte(*parser_carte(texte)) for texte in arguments.cartes]
+    resultat = estimer_equite(cartes, arguments.adversaires, arguments.essais, graine=arguments.graine,
+                              processus=arguments.processus, erreur_cible=arguments.erreur_cible,
+                              budget_secondes=arguments.budget)
+    
+    print(f"essais: {resultat.essais}")
+    print(f"victoires: {resultat.victoires / resultat.essais:.4f}")
+    print(f"égalités: {resultat.egalites / resultat.essais:.4f}")
+    print(f"défaites: {resultat.defaites / resultat.essais:.4f}")
+    print(f"équité: {resultat.equite:.4f} ± {resultat.erreur_type:.4f}")
+
+if __name__ == "__main__":
+    main()
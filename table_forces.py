@@ -0,0 +1,127 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from math import comb
+from typing import List, Optional, Sequence
+
+import enumeration
+import poker
+from poker import Carte, categorie_force, nom_combinaison
+
+MAGIE: bytes = b'PKFT'
+VERSION: int = 1
+ENTETE = struct.Struct('<4sHHI')
+NOMBRE_MAINS: int = comb(52, 5)
+CHEMIN_DEFAUT: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'forces_5_cartes.bin')
+
+_BINOMIAUX: List[List[int]] = [[comb(n, k) for n in range(52)] for k in range(6)]
+_B1, _B2, _B3, _B4, _B5 = _BINOMIAUX[1:]
+
+def indice_colex(codes: Sequence[int]) -> int:
+    c0, c1, c2, c3, c4 = sorted(codes)
+    return _B1[c0] + _B2[c1] + _B3[c2] + _B4[c3] + _B5[c4]
+
+def calculer_forces() -> 'array[int]':
+    return enumeration.forces()
+
+def generer(chemin: str = CHEMIN_DEFAUT) -> None:
+    forces = calculer_forces()
+    if sys.byteorder != 'little':
+        forces.byteswap()
+    
+    temporaire = f"{chemin}.tmp"
+    with open(temporaire, 'wb') as fichier:
+        fichier.write(ENTETE.pack(MAGIE, VERSION, forces.itemsize, len(forces)))
+        forces.tofile(fichier)
+    os.replace(temporaire, chemin)
+
+class TableForces:
+    def __init__(self, chemin: str = CHEMIN_DEFAUT) -> None:
+        with open(chemin, 'rb') as fichier:
+            self._mmap: mmap.mmap = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magie, version, taille, nombre = ENTETE.unpack_from(self._mmap)
+        if magie != MAGIE or version != VERSION or taille != 2 or nombre != NOMBRE_MAINS:
+            self._mmap.close()
+            raise ValueError(f"table de forces non valide: {chemin}")
+        if len(self._mmap) != ENTETE.size + 2 * NOMBRE_MAINS:
+            self._mmap.close()
+            raise ValueError(f"table de forces tronquée: {chemin}")
+        
+        if sys.byteorder == 'little':
+            self.forces: Sequence[int] = memoryview(self._mmap)[ENTETE.size:].cast('H')
+        else:
+            forces: 'array[int]' = array('H', self._mmap[ENTETE.size:])
+            forces.byteswap()
+            self.forces = forces
+    
+    def force_codes(self, codes: Sequence[int]) -> int:
+        c0, c1, c2, c3, c4 = sorted(codes)
+        if not c0 < c1 < c2 < c3 < c4:
+            return 0
+        return self.forces[_B1[c0] + _B2[c1] + _B3[c2] + _B4[c3] + _B5[c4]]
+    
+    def force(self, cartes: Sequence[Carte]) -> int:
+        c0, c1, c2, c3, c4 = cartes
+        return self.force_codes((c0.code, c1.code, c2.code, c3.code, c4.code))
+    
+    def fermer(self) -> None:
+        if isinstance(self.forces, memoryview):
+            self.forces.release()
+        self._mmap.close()
+
+_table_active: Optional[TableForces] = None
+
+def activer(chemin: str = CHEMIN_DEFAUT) -> TableForces:
+    global _table_active
+    desactiver()
+    _table_active = TableForces(chemin)
+    poker.installer_moteur_force(_table_active.force)
+    return _table_active
+
+def desactiver() -> None:
+    global _table_active
+    poker.installer_moteur_force(None)
+    if _table_active is not None:
+        _table_active.fermer()
+        _table_active = None
+
+def verifier(chemin: str = CHEMIN_DEFAUT) -> List[int]:
+    table = TableForces(chemin)
+    try:
+        attendu = calculer_forces()
+        if memoryview(attendu).cast('B') != memoryview(table.forces).cast('B'):
+            raise ValueError(f"table de forces corrompue: {chemin}")
+        
+        categories: List[int] = [0] * 10
+        for force in attendu:
+            categories[categorie_force(force)] += 1
+        return categories
+    finally:
+        table.fermer()
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Table des forces des 2 598 960 mains de 5 cartes")
+    analyseur.add_argument('commande', choices=['generer', 'verifier'])
+    analyseur.add_argument('chemin', nargs='?', default=CHEMIN_DEFAUT)
+    arguments = analyseur.parse_args()
+    
+    if arguments.commande == 'generer':
+        generer(arguments.chemin)
+        print(f"table écrite: {arguments.chemin}")
+    
+    try:
+        categories = verifier(arguments.chemin)
+    except (OSError, ValueError) as e:
+        print(f"Erreur: {e}")
+        sys.exit(1)
+    
+    for categorie in range(9, -1, -1):
+        print(f"{nom_combinaison(categorie)}: {categories[categorie]}")
+    print("table valide")
+
+if __name__ == "__main__":
+    main()
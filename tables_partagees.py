@@ -0,0 +1,56 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from multiprocessing.context import BaseContext
+from types import TracebackType
+from typing import Iterator, Optional, Type
+
+import poker
+
+# Segment attaché par ce processus : il reste ouvert jusqu'à sa fin, les tables
+# installées dans poker n'étant que des vues sur son contenu.
+_segment_attache: Optional[shared_memory.SharedMemory] = None
+
+class TablesPartagees:
+    def __init__(self) -> None:
+        poker._assurer_tables()
+        donnees = poker._serialiser_tables((poker._FORCE_PAR_PRODUIT, poker._FORCE_COULEUR, poker._EVALUATIONS))
+        self.taille: int = len(donnees)
+        self._segment: Optional[shared_memory.SharedMemory] = shared_memory.SharedMemory(create=True, size=self.taille)
+        self._segment.buf[:self.taille] = donnees
+        self.nom: str = self._segment.name
+    
+    def fermer(self) -> None:
+        if self._segment is None:
+            return
+        self._segment.close()
+        self._segment.unlink()
+        self._segment = None
+    
+    def __enter__(self) -> 'TablesPartagees':
+        return self
+    
+    def __exit__(self, type_exception: Optional[Type[BaseException]], exception: Optional[BaseException],
+                 trace: Optional[TracebackType]) -> None:
+        self.fermer()
+
+def attacher_tables(nom: str, taille: int) -> None:
+    global _segment_attache
+    # Un processus créé par fork hérite déjà des tables du processus parent.
+    if poker._tables_pretes:
+        return
+    
+    if sys.version_info >= (3, 13):
+        segment = shared_memory.SharedMemory(nom, track=False)
+    else:
+        segment = shared_memory.SharedMemory(nom)
+    poker._installer_tables(poker._deserialiser_tables(segment.buf[:taille].toreadonly()))
+    _segment_attache = segment
+
+@contextmanager
+def executeur_partage(processus: int, contexte: Optional[BaseContext] = None) -> Iterator[ProcessPoolExecutor]:
+    with TablesPartagees() as tables:
+        with ProcessPoolExecutor(max_workers=processus, mp_context=contexte, initializer=attacher_tables,
+                                 initargs=(tables.nom, tables.taille)) as executeur:
+            yield executeur
@@ -1,10 +1,46 @@
 import unittest
-from typing import List
-from poker import Carte, Main, comparer_mains, nom_combinaison
-from jeu_poker import JeuPoker, parser_carte, afficher_main, afficher_resultat
+from typing import List, Sequence
+from poker import Carte, Main, classer_mains, comparer_mains, nom_combinaison, categorie_force, evaluation_force, force_meilleure_main, meilleure_main, canoniser, indice_isomorphe, CARTES, COULEURS, RANGS, NOMBRE_FORCES, NOMBRE_CLASSES_ISOMORPHES
+from jeu_poker import JeuPoker, TablePoker, parser_carte, afficher_main, afficher_resultat
 import io
+import json
+from array import array
+import random
+import itertools
+import math
+import os
+import pickle
+import multiprocessing
+import subprocess
+import tempfile
 import sys
 from unittest.mock import patch
+import asyncio
+import benchmarks
+import client_charge
+import format_binaire
+import historique
+import instrumentation
+import jeu_poker
+import poker
+import moteur_echange
+import parties_auto
+import probabilites
+import serveur
+from lot_mains import LotMains
+from paquet import PaquetMasque
+import simulation
+import table_forces
+import enumeration
+import tables_partagees
+import tournoi
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+    import evaluation_lot
+except ImportError:
+    np = None
 
 class TestPoker(unittest.TestCase):
     def test_creation_carte(self) -> None:
@@ -18,6 +54,99 @@ class TestPoker(unittest.TestCase):
         self.assertEqual(carte2.couleur, 'Pique')
         self.assertEqual(carte2.valeur, 0)
     
+    def test_cartes_uniques(self) -> None:
+        carte: Carte = Carte('As', 'Coeur')
+        self.assertIs(carte, Carte('As', 'Coeur'))
+        self.assertEqual(carte.code, (12 << 2) | 0)
+        self.assertIs(Carte.depuis_code(carte.code), carte)
+        self.assertEqual(hash(carte), hash(Carte('As', 'Coeur')))
+        self.assertEqual(len({Carte('As', 'Coeur'), Carte('As', 'Pique'), Carte('As', 'Coeur')}), 2)
+        self.assertIs(pickle.loads(pickle.dumps(carte)), carte)
+        
+        with self.assertRaises(AttributeError):
+            carte.rang = 'Roi'
+        
+        with self.assertRaises(ValueError):
+            Carte('As', 'Étoile')
+    
+    def test_main_immuable(self) -> None:
+        cartes = [Carte('As', 'Coeur'), Carte('As', 'Pique'), Carte('Roi', 'Coeur'), Carte('2', 'Trèfle'), Carte('7', 'Carreau')]
+        main = Main(cartes)
+        autre = Main(list(reversed(cartes)))
+        
+        self.assertIsInstance(main.cartes, tuple)
+        self.assertEqual(main, autre)
+        self.assertEqual(hash(main), hash(autre))
+        self.assertEqual(len({main, autre, Main(cartes[:4] + [Carte('8', 'Carreau')])}), 2)
+        self.assertNotEqual(Main([cartes[0]] * 2 + cartes[2:]), Main([cartes[0]] + cartes[2:] + [cartes[2]]))
+        
+        copie = pickle.loads(pickle.dumps(main))
+        self.assertEqual(copie, main)
+        self.assertEqual(copie.force(), main.force())
+        
+        with self.assertRaises(AttributeError):
+            main.cartes = ()
+        with self.assertRaises(AttributeError):
+            main.autre = 1
+    
+    def test_cache_forces(self) -> None:
+        cartes = [Carte('Dame', couleur) for couleur in COULEURS] + [Carte('3', 'Pique')]
+        poker.vider_cache_forces()
+        try:
+            main = Main(cartes)
+            force = main.force()
+            self.assertEqual(main.evaluer(), (7, [10, 1]))
+            self.assertEqual(main.categorie(), 7)
+            self.assertEqual(poker.statistiques_cache_forces()['echecs'], 1)
+            
+            Main(list(reversed(cartes))).force()
+            statistiques = poker.statistiques_cache_forces()
+            self.assertEqual((statistiques['succes'], statistiques['echecs'], statistiques['taille']), (1, 1, 1))
+            
+            poker.configurer_cache_forces(2)
+            generateur = random.Random(18)
+            for _ in range(10):
+                Main(generateur.sample(CARTES, 5)).force()
+            self.assertEqual(poker.statistiques_cache_forces()['taille'], 2)
+            self.assertEqual(Main(cartes).force(), force)
+            
+            with self.assertRaises(ValueError):
+                poker.configurer_cache_forces(-1)
+        finally:
+            poker.configurer_cache_forces(poker.TAILLE_CACHE_FORCES)
+            poker.vider_cache_forces()
+    
+    def test_tables_paresseuses(self) -> None:
+        code = ("import poker; assert not poker._tables_pretes; "
+                "print(poker.Main(poker.CARTES[:5]).force(), poker._tables_pretes)")
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'tables.bin')
+            environnement = dict(os.environ, **{poker.VARIABLE_CACHE_TABLES: chemin})
+            for _ in range(2):
+                sortie = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                        env=environnement, capture_output=True, text=True, check=True).stdout
+                self.assertEqual(sortie.split(), [str(Main(CARTES[:5]).force()), 'True'])
+                self.assertTrue(os.path.exists(chemin))
+    
+    def test_cache_tables(self) -> None:
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'tables.bin')
+            poker.sauvegarder_tables(chemin)
+            par_produit, par_couleur, evaluations = poker.charger_tables(chemin)
+            self.assertEqual(par_produit, poker._FORCE_PAR_PRODUIT)
+            self.assertEqual(list(par_couleur), list(poker._FORCE_COULEUR))
+            self.assertEqual(evaluations, poker._EVALUATIONS)
+            
+            with open(chemin, 'rb') as fichier:
+                donnees = bytearray(fichier.read())
+            donnees[-1] ^= 1
+            with open(chemin, 'wb') as fichier:
+                fichier.write(donnees)
+            with self.assertRaises(ValueError):
+                poker.charger_tables(chemin)
+            with self.assertRaises(ValueError):
+                poker.charger_tables(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'README.md'))
+    
     def test_comparaison_cartes(self) -> None:
         as_coeur: Carte = Carte('As', 'Coeur')
         roi_coeur: Carte = Carte('Roi', 'Coeur')
@@ -284,7 +413,7 @@ class TestPoker(unittest.TestCase):
         
         with self.assertRaises(ValueError):
             jeu.definir_main_joueur(cartes[:4])
-
+    
     def test_creer_jeu(self) -> None:
         jeu = JeuPoker()
         cartes = jeu.creer_jeu()
@@ -300,7 +429,7 @@ class TestPoker(unittest.TestCase):
         jeu = JeuPoker()
         jeu_original = jeu.creer_jeu().copy()
         jeu.melanger()
-
+        
         self.assertNotEqual([str(c) for c in jeu_original], [str(c) for c in jeu.jeu])
         
         self.assertEqual(len(jeu.jeu), 52)
@@ -448,7 +577,7 @@ class TestPoker(unittest.TestCase):
         jeu.main_joueur = None
         with self.assertRaises(ValueError):
             jeu.determiner_gagnant()
-        
+    
     def test_afficher_main(self) -> None:
         main = Main([
             Carte('As', 'Coeur'),
@@ -521,5 +650,989 @@ class TestPoker(unittest.TestCase):
         self.assertIn("resultat final:", output)
         self.assertIn("Merci d'avoir joué!", output)
 
+class TestEvaluateur(unittest.TestCase):
+    def test_tables_contre_predicats(self) -> None:
+        for valeurs in itertools.combinations_with_replacement(range(13), 5):
+            if valeurs[0] == valeurs[4]:
+                continue
+            
+            couleurs = [0, 0, 1, 2, 3] if valeurs[1] == valeurs[4] else [0, 1, 2, 3, 0]
+            
+            cartes = [Carte(RANGS[v], COULEURS[c]) for v, c in zip(valeurs, couleurs)]
+            self.assertEqual(len(set(cartes)), 5)
+            main: Main = Main(cartes)
+            self.assertEqual(main.evaluer(), main.evaluer_par_predicats())
+            
+            if len(set(valeurs)) == 5:
+                main = Main([Carte(RANGS[v], 'Pique') for v in valeurs])
+                self.assertEqual(main.evaluer(), main.evaluer_par_predicats())
+    
+    def test_main_avec_doublons(self) -> None:
+        main: Main = Main([Carte('As', 'Coeur')] * 5)
+        self.assertEqual(main.evaluer(), main.evaluer_par_predicats())
+        self.assertEqual(main.force(), 0)
+        
+        carre: Main = Main([
+            Carte('7', 'Coeur'),
+            Carte('7', 'Carreau'),
+            Carte('7', 'Trèfle'),
+            Carte('7', 'Pique'),
+            Carte('9', 'Coeur')
+        ])
+        self.assertEqual(comparer_mains(main, carre), -1)
+    
+    def test_forces(self) -> None:
+        self.assertEqual(NOMBRE_FORCES, 7462)
+        
+        evaluations = [evaluation_force(force) for force in range(1, NOMBRE_FORCES + 1)]
+        self.assertEqual(evaluations, sorted(evaluations))
+        self.assertEqual(evaluations[0], (0, [5, 3, 2, 1, 0]))
+        self.assertEqual(evaluations[-1], (9, []))
+        self.assertEqual(categorie_force(NOMBRE_FORCES), 9)
+        
+        with self.assertRaises(ValueError):
+            categorie_force(0)
+    
+    def test_force_et_comparaison(self) -> None:
+        generateur = random.Random(7)
+        mains = [Main(generateur.sample(CARTES, 5)) for _ in range(500)]
+        forces = array('H', (main.force() for main in mains))
+        
+        for main, force in zip(mains, forces):
+            self.assertEqual(main.evaluer(), evaluation_force(force))
+            self.assertEqual(main.categorie(), main.evaluer()[0])
+        
+        for main1, main2 in zip(mains, mains[1:]):
+            attendu = (main1.evaluer() > main2.evaluer()) - (main1.evaluer() < main2.evaluer())
+            self.assertEqual(comparer_mains(main1, main2), attendu)
+    
+    @unittest.skipUnless(os.environ.get('POKER_TESTS_EXHAUSTIFS'), "test exhaustif long")
+    def test_toutes_les_mains(self) -> None:
+        for cartes in itertools.combinations(CARTES, 5):
+            main: Main = Main(list(cartes))
+            self.assertEqual(main.evaluer(), main.evaluer_par_predicats())
+
+class TestMeilleureMain(unittest.TestCase):
+    def test_contre_combinaisons(self) -> None:
+        generateur = random.Random(13)
+        for nombre in (5, 6, 7):
+            for _ in range(300):
+                cartes = generateur.sample(CARTES, nombre)
+                attendu = max(Main(list(choix)).force() for choix in itertools.combinations(cartes, 5))
+                self.assertEqual(force_meilleure_main(cartes), attendu)
+                
+                main = meilleure_main(cartes)
+                self.assertEqual(main.force(), attendu)
+                self.assertTrue(all(carte in cartes for carte in main.cartes))
+    
+    def test_quinte_flush_dans_sept_cartes(self) -> None:
+        cartes = [
+            Carte('As', 'Coeur'), Carte('2', 'Coeur'), Carte('3', 'Coeur'), Carte('4', 'Coeur'),
+            Carte('5', 'Coeur'), Carte('5', 'Pique'), Carte('5', 'Trèfle')
+        ]
+        main = meilleure_main(cartes)
+        self.assertEqual(main.evaluer(), (8, [3]))
+        self.assertEqual(str(main), "As♥ 5♥ 4♥ 3♥ 2♥")
+    
+    def test_nombre_de_cartes_invalide(self) -> None:
+        with self.assertRaises(ValueError):
+            force_meilleure_main(CARTES[:4])
+        with self.assertRaises(ValueError):
+            force_meilleure_main(CARTES[:8])
+        with self.assertRaises(ValueError):
+            force_meilleure_main([CARTES[0]] * 6)
+
+class TestAbattage(unittest.TestCase):
+    def test_contre_comparaisons(self) -> None:
+        generateur = random.Random(17)
+        for sieges in range(2, 11):
+            for _ in range(100):
+                cartes = generateur.sample(CARTES, 5 * sieges)
+                mains = [Main(cartes[5 * i:5 * i + 5]) for i in range(sieges)]
+                abattage = classer_mains(mains)
+                
+                self.assertEqual(abattage.forces, [main.force() for main in mains])
+                for i, main in enumerate(mains):
+                    plus_fortes = sum(comparer_mains(autre, main) > 0 for autre in mains)
+                    self.assertEqual(abattage.rangs[i], 1 + plus_fortes)
+                self.assertEqual(abattage.gagnants, [i for i in range(sieges) if abattage.rangs[i] == 1])
+    
+    def test_pot_partage(self) -> None:
+        quinte_coeur = Main([Carte(rang, 'Coeur') for rang in ['6', '7', '8', '9', '10']][:4] + [Carte('10', 'Pique')])
+        quinte_carreau = Main([Carte(rang, 'Carreau') for rang in ['6', '7', '8', '9']] + [Carte('10', 'Trèfle')])
+        paire = Main([Carte('As', 'Coeur'), Carte('As', 'Pique'), Carte('2', 'Trèfle'), Carte('3', 'Trèfle'), Carte('4', 'Coeur')])
+        
+        abattage = classer_mains([paire, quinte_coeur, quinte_carreau])
+        self.assertEqual(abattage.gagnants, [1, 2])
+        self.assertEqual(abattage.rangs, [3, 1, 1])
+        
+        doublon = Main([Carte('As', 'Coeur')] + [Carte('As', couleur) for couleur in COULEURS])
+        abattage = classer_mains([paire, doublon])
+        self.assertEqual(abattage.forces[1], 0)
+        self.assertEqual(comparer_mains(paire, doublon), 1)
+        self.assertEqual((abattage.gagnants, abattage.rangs), ([0], [1, 2]))
+        
+        with self.assertRaises(ValueError):
+            classer_mains([])
+    
+    def test_table(self) -> None:
+        with self.assertRaises(ValueError):
+            TablePoker(sieges=11)
+        with self.assertRaises(ValueError):
+            TablePoker(sieges=3, strategies=[None])
+        
+        table = TablePoker(sieges=4, strategies=[None, jeu_poker.indices_echange_heuristique] * 2,
+                           paquet=PaquetMasque(random.Random(17)))
+        with self.assertRaises(ValueError):
+            table.abattage()
+        
+        table.nouvelle_partie()
+        self.assertEqual(len(table.jeu), 52 - 20)
+        cartes = {carte for main in table.mains for carte in main.cartes}
+        self.assertEqual(len(cartes), 20)
+        
+        avant = list(table.mains)
+        table.echanger_cartes(0, [0, 0, 4, 9])
+        self.assertEqual(len(table.jeu), 30)
+        self.assertEqual(len(set(table.mains[0].cartes) & set(avant[0].cartes)), 3)
+        
+        table.echanger_cartes_automatiques()
+        self.assertEqual(table.mains[2], avant[2])
+        abattage = table.abattage()
+        self.assertEqual(abattage, classer_mains(table.mains))
+        self.assertEqual(table.determiner_gagnants(), abattage.gagnants)
+        
+        pleine = TablePoker(sieges=10)
+        pleine.nouvelle_partie()
+        pleine.echanger_cartes(0, [0, 1])
+        with self.assertRaises(ValueError):
+            pleine.echanger_cartes(1, [0])
+
+class TestEtatMain(unittest.TestCase):
+    def test_echanges_incrementaux(self) -> None:
+        generateur = random.Random(19)
+        etat = poker.EtatMain(generateur.sample(CARTES, 5))
+        for _ in range(2000):
+            disponibles = [carte for carte in CARTES if carte not in etat.cartes]
+            indices = generateur.sample(range(5), generateur.randint(1, 5))
+            remplacements = dict(zip(indices, generateur.sample(disponibles, len(indices))))
+            
+            attendue = Main([remplacements.get(i, carte) for i, carte in enumerate(etat.cartes)]).force()
+            avant = list(etat.cartes)
+            self.assertEqual(etat.force_si(remplacements), attendue)
+            self.assertEqual(etat.cartes, avant)
+            
+            etat.echanger(remplacements)
+            self.assertEqual(etat.force(), attendue)
+            self.assertEqual(etat.masque, Main(etat.cartes).masque)
+            self.assertEqual(etat.comptes_rangs, [sum(carte.valeur == v for carte in etat.cartes) for v in range(13)])
+    
+    def test_couleur(self) -> None:
+        etat = poker.EtatMain([Carte(rang, 'Pique') for rang in ['As', 'Roi', 'Dame', 'Valet', '2']])
+        self.assertEqual(categorie_force(etat.force()), 5)
+        self.assertEqual(etat.force_si({4: Carte('10', 'Pique')}), NOMBRE_FORCES)
+        self.assertEqual(categorie_force(etat.force_si({4: Carte('10', 'Coeur')})), 4)
+        
+        evaluer = etat.evaluateur_remplacement([4])
+        self.assertEqual(evaluer([Carte('10', 'Pique')]), NOMBRE_FORCES)
+        self.assertEqual(evaluer([Carte('As', 'Coeur')]), Main(etat.cartes[:4] + [Carte('As', 'Coeur')]).force())
+        self.assertEqual(poker.evaluateur_tirage([])(etat.cartes), etat.force())
+    
+    def test_evaluateur_tirage(self) -> None:
+        generateur = random.Random(20)
+        for gardees_nombre in range(6):
+            for _ in range(300):
+                cartes = generateur.sample(CARTES, 5)
+                if generateur.random() < 0.3:
+                    cartes = [Carte(carte.rang, 'Trèfle') for carte in cartes]
+                    if len(set(cartes)) < 5:
+                        continue
+                evaluer = poker.evaluateur_tirage(cartes[:gardees_nombre])
+                self.assertEqual(evaluer(cartes[gardees_nombre:]), Main(cartes).force())
+    
+    def test_main_remplacer(self) -> None:
+        main = Main([Carte('As', 'Coeur'), Carte('Roi', 'Coeur'), Carte('7', 'Pique'), Carte('4', 'Trèfle'), Carte('2', 'Carreau')])
+        remplacements = {2: Carte('As', 'Pique'), 4: Carte('Roi', 'Pique')}
+        
+        sans_etat = main.remplacer(remplacements)
+        self.assertEqual(sans_etat.categorie(), 2)
+        
+        main.etat()
+        avec_etat = main.remplacer(remplacements)
+        self.assertEqual(avec_etat, sans_etat)
+        self.assertEqual(avec_etat.evaluer(), sans_etat.evaluer())
+        self.assertEqual(str(main), "As♥ Roi♥ 7♠ 4♣ 2♦")
+        
+        full = avec_etat.remplacer({4: Carte('As', 'Trèfle')})
+        self.assertEqual([str(carte) for carte in full.cartes], [str(carte) for carte in full.etat().cartes])
+        self.assertEqual(full.force(), Main(list(full.cartes)).force())
+        self.assertEqual(full.categorie(), 6)
+
+class TestProbabilites(unittest.TestCase):
+    def setUp(self) -> None:
+        probabilites.vider()
+    
+    def test_contre_enumeration(self) -> None:
+        generateur = random.Random(21)
+        for essai in range(40):
+            if essai % 4 == 0:
+                cartes = generateur.sample([carte for carte in CARTES if carte.couleur == 'Coeur'], 5)
+            else:
+                cartes = generateur.sample(CARTES, 5)
+            main = Main(cartes)
+            gardees = sorted(generateur.sample(range(5), generateur.choice([3, 4, 5])))
+            
+            cartes_gardees = [main.cartes[i] for i in gardees]
+            restantes = [carte for carte in CARTES if carte not in main.cartes]
+            comptes = [0] * 10
+            somme_forces = 0
+            for tirage in itertools.combinations(restantes, 5 - len(gardees)):
+                force = poker.force_cartes(cartes_gardees + list(tirage))
+                comptes[categorie_force(force)] += 1
+                somme_forces += force
+            
+            distribution = probabilites.distribution_tirage(main, gardees)
+            self.assertEqual(distribution.comptes, tuple(comptes))
+            self.assertEqual(distribution.somme_forces, somme_forces)
+            self.assertAlmostEqual(sum(distribution.probabilites.values()), 1.0)
+    
+    def test_quinte_flush_royale(self) -> None:
+        main = Main([Carte(rang, 'Pique') for rang in ['As', 'Roi', 'Dame', 'Valet']] + [Carte('2', 'Coeur')])
+        distribution = probabilites.distribution_tirage(main, [0, 1, 2, 3])
+        self.assertEqual(distribution.total, 47)
+        self.assertAlmostEqual(distribution.probabilites['Quinte Flush Royale'], 1 / 47)
+        self.assertAlmostEqual(distribution.probabilites['Couleur'], 8 / 47)
+        
+        tout_jeter = probabilites.distribution_tirage(main, [])
+        self.assertEqual(tout_jeter.total, 1533939)
+        self.assertEqual(sum(tout_jeter.comptes), tout_jeter.total)
+        
+        with self.assertRaises(ValueError):
+            probabilites.distribution_tirage(main, [5])
+    
+    def test_memo_canonique(self) -> None:
+        main1 = Main([Carte('Dame', 'Coeur'), Carte('Dame', 'Pique'), Carte('9', 'Coeur'), Carte('6', 'Trèfle'), Carte('2', 'Carreau')])
+        main2 = Main([Carte('Dame', 'Trèfle'), Carte('Dame', 'Carreau'), Carte('9', 'Trèfle'), Carte('6', 'Pique'), Carte('2', 'Coeur')])
+        
+        self.assertEqual(probabilites.distribution_tirage(main1, [0, 1]), probabilites.distribution_tirage(main2, [0, 1]))
+        self.assertEqual(probabilites.statistiques_cache(), {'succes': 1, 'echecs': 1, 'taille': 1})
+        
+        self.assertEqual(probabilites.choisir_echange(main1), [2, 3, 4])
+        self.assertEqual(probabilites.choisir_echange(Main([Carte(rang, 'Coeur') for rang in ['9', '8', '7', '6', '5']])), [])
+        self.assertIs(parties_auto.resoudre_strategie('exacte'), probabilites.choisir_echange)
+        
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'probabilites.json')
+            probabilites.sauvegarder(chemin)
+            taille = probabilites.statistiques_cache()['taille']
+            attendue = probabilites.distribution_tirage(main1, [0, 1, 3])
+            
+            probabilites.vider()
+            self.assertEqual(probabilites.charger(chemin), taille)
+            self.assertEqual(probabilites.distribution_tirage(main1, [0, 1, 3]), attendue)
+            self.assertEqual(probabilites.statistiques_cache()['echecs'], 0)
+
+class TestPaquetMasque(unittest.TestCase):
+    def test_tirages_distincts(self) -> None:
+        paquet = PaquetMasque(random.Random(3))
+        cartes = paquet.tirer(52)
+        
+        self.assertEqual(len(set(cartes)), 52)
+        self.assertEqual(len(paquet), 0)
+        self.assertEqual(paquet.masque, (1 << 52) - 1)
+        with self.assertRaises(IndexError):
+            paquet.pop()
+        
+        paquet.reinitialiser()
+        self.assertEqual(len(paquet), 52)
+        self.assertFalse(paquet.est_sortie(cartes[0]))
+    
+    def test_reproductible(self) -> None:
+        paquet1 = PaquetMasque(random.Random(8))
+        paquet2 = PaquetMasque(random.Random(8))
+        self.assertEqual(paquet1.tirer(10), paquet2.tirer(10))
+    
+    def test_retirer(self) -> None:
+        paquet = PaquetMasque(random.Random(2))
+        mortes = [Carte('As', 'Coeur'), Carte('Roi', 'Pique')]
+        paquet.retirer(mortes)
+        paquet.retirer(mortes)
+        
+        self.assertEqual(len(paquet), 50)
+        self.assertNotIn(mortes[0], paquet)
+        self.assertTrue(paquet.est_sortie(mortes[1]))
+        self.assertEqual(set(paquet.tirer(50)) & set(mortes), set())
+    
+    def test_jeu_avec_paquet(self) -> None:
+        paquet = PaquetMasque(random.Random(1))
+        jeu = JeuPoker(paquet=paquet)
+        
+        for _ in range(3):
+            jeu.nouvelle_partie()
+            jeu.main_joueur = jeu.distribuer_main()
+            jeu.echanger_cartes_joueur([0, 2])
+            jeu.echanger_cartes_ordi()
+            
+            self.assertIs(jeu.jeu, paquet)
+            cartes = list(jeu.main_joueur.cartes) + list(jeu.main_ordi.cartes)
+            self.assertEqual(len(set(cartes)), 10)
+            self.assertTrue(all(paquet.est_sortie(carte) for carte in cartes))
+            self.assertIn(jeu.determiner_gagnant(), ["joueur", "ordinateur", "égalité"])
+
+def _ecrire_table_couleur() -> None:
+    poker._FORCE_COULEUR[0] = 1
+
+class TestTablesPartagees(unittest.TestCase):
+    def test_publier_et_fermer(self) -> None:
+        with tables_partagees.TablesPartagees() as tables:
+            segment = shared_memory.SharedMemory(tables.nom)
+            self.assertEqual(poker._deserialiser_tables(segment.buf[:tables.taille])[2], poker._EVALUATIONS)
+            segment.close()
+        
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(tables.nom)
+        tables.fermer()
+    
+    def test_executeur_partage(self) -> None:
+        generateur = random.Random(22)
+        mains = [Main(generateur.sample(CARTES, 5)) for _ in range(20)]
+        with tables_partagees.executeur_partage(2, multiprocessing.get_context('spawn')) as executeur:
+            forces = list(executeur.map(Main.force, mains))
+            # Les tables attachées sont en lecture seule : un processus ne peut pas
+            # corrompre celles des autres.
+            with self.assertRaises(TypeError):
+                executeur.submit(_ecrire_table_couleur).result()
+        self.assertEqual(forces, [main.force() for main in mains])
+
+class TestEnumeration(unittest.TestCase):
+    def test_frequences_completes(self) -> None:
+        self.assertEqual(tuple(enumeration.frequences_categories()), enumeration.FREQUENCES_CATEGORIES)
+    
+    def test_mains_partielles(self) -> None:
+        connues = [Carte('As', 'Pique'), Carte('Roi', 'Pique'), Carte('10', 'Pique')]
+        mortes = [Carte('Dame', 'Pique'), Carte('2', 'Coeur')]
+        mains = list(enumeration.mains(connues, mortes))
+        self.assertEqual(len(mains), 47 * 46 // 2)
+        self.assertEqual(list(enumeration.forces(connues, mortes)), [Main(list(main)).force() for main in mains])
+        
+        restantes = enumeration.disponibles(connues, mortes)
+        colex = sorted(itertools.combinations(restantes, 2), key=lambda paire: (paire[1].code, paire[0].code))
+        self.assertEqual(mains, [tuple(connues) + paire for paire in colex])
+        
+        frequences = enumeration.frequences_categories(connues, mortes)
+        self.assertEqual(frequences[9], 0)
+        self.assertEqual(sum(frequences), len(mains))
+        
+        with self.assertRaises(ValueError):
+            enumeration.forces(connues, connues)
+    
+    def test_equite_exacte(self) -> None:
+        quinte_royale = [Carte(rang, 'Coeur') for rang in ('As', 'Roi', 'Dame', 'Valet', '10')]
+        resultat = enumeration.equite_exacte(quinte_royale)
+        self.assertEqual((resultat.victoires, resultat.egalites, resultat.defaites), (math.comb(47, 5) - 3, 3, 0))
+        
+        with self.assertRaises(ValueError):
+            enumeration.equite_exacte(quinte_royale[:4])
+    
+    def test_comparer_moteur(self) -> None:
+        connues = [Carte('7', 'Trèfle'), Carte('7', 'Carreau'), Carte('2', 'Pique')]
+        self.assertEqual(enumeration.comparer_moteur(poker.force_cartes, connues=connues), [])
+        
+        def moteur_faux(cartes: Sequence[Carte]) -> int:
+            return 0 if Carte('As', 'Coeur') in cartes else poker.force_cartes(cartes)
+        
+        ecarts = enumeration.comparer_moteur(moteur_faux, limite=3, connues=connues)
+        self.assertEqual(len(ecarts), 3)
+        self.assertTrue(all(Carte('As', 'Coeur') in main and obtenue == 0 for main, _, obtenue in ecarts))
+
+class TestLotMains(unittest.TestCase):
+    def setUp(self) -> None:
+        generateur = random.Random(25)
+        self.mains = [Main(generateur.sample(CARTES, 5)) for _ in range(500)]
+        self.lot = LotMains.depuis_mains(self.mains)
+    
+    def test_materialisation(self) -> None:
+        self.assertEqual(len(self.lot), 500)
+        self.assertEqual(self.lot.taille_octets(), 500 * 6)
+        self.assertEqual(self.lot[7], self.mains[7])
+        self.assertEqual(self.lot[7].force(), self.mains[7].force())
+        self.assertEqual(self.lot[-1].evaluer(), self.mains[-1].evaluer())
+        self.assertEqual(list(self.lot), self.mains)
+        
+        tranche = self.lot[10:20:2]
+        self.assertIsInstance(tranche, LotMains)
+        self.assertEqual(list(tranche), self.mains[10:20:2])
+        
+        codes = [[carte.code for carte in main.cartes] for main in self.mains]
+        self.assertEqual(list(LotMains.depuis_codes(codes).forces), list(self.lot.forces))
+        self.assertEqual(list(LotMains(self.lot.paquets).forces), list(self.lot.forces))
+        with self.assertRaises(ValueError):
+            self.lot.ajouter_codes([1, 1, 2, 3, 4])
+        with self.assertRaises(ValueError):
+            LotMains(self.lot.paquets, [1, 2])
+    
+    def test_categories_et_tri(self) -> None:
+        comptes = [0] * 10
+        for main in self.mains:
+            comptes[main.categorie()] += 1
+        self.assertEqual(self.lot.comptes_categories(), comptes)
+        
+        paires = self.lot.filtrer_categorie(1, 2)
+        self.assertEqual(len(paires), comptes[1] + comptes[2])
+        self.assertTrue(all(main.categorie() in (1, 2) for main in paires))
+        
+        trie = self.lot.trier(decroissant=True)
+        self.assertEqual(list(trie.forces), sorted(self.lot.forces, reverse=True))
+        self.assertEqual(sorted(trie.paquets), sorted(self.lot.paquets))
+        self.assertEqual(trie[0].force(), max(main.force() for main in self.mains))
+    
+    def test_fichier(self) -> None:
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'mains.bin')
+            self.lot.sauvegarder(chemin)
+            relu = LotMains.charger(chemin)
+        self.assertEqual(relu.paquets, self.lot.paquets)
+        self.assertEqual(relu.forces, self.lot.forces)
+    
+    @unittest.skipIf(np is None, "NumPy n'est pas installé")
+    def test_tableaux(self) -> None:
+        codes = self.lot.codes_tableau()
+        self.assertEqual(codes.shape, (500, 5))
+        self.assertEqual(tuple(codes[3]), self.lot.codes(3))
+        self.assertTrue((evaluation_lot.evaluer_lot(codes) == self.lot.tableaux()[1]).all())
+
+class TestTournoi(unittest.TestCase):
+    def test_strategie_contre_elle_meme(self) -> None:
+        resultat = tournoi.jouer_duel('heuristique', 'heuristique', taille_lot=50)
+        self.assertEqual(resultat.donnes, 50)
+        self.assertEqual(resultat.score, 0.5)
+        self.assertEqual(resultat.erreur_type, 0.0)
+        self.assertEqual(resultat.victoires_a, resultat.victoires_b)
+    
+    def test_duel_reproductible(self) -> None:
+        sequentiel = tournoi.jouer_duel('heuristique', 'aucun', precision=0.0, donnes_max=300, taille_lot=100)
+        with tables_partagees.executeur_partage(2) as executeur:
+            parallele = tournoi.jouer_duel('heuristique', 'aucun', precision=0.0, donnes_max=300, taille_lot=100,
+                                           executeur=executeur, processus=2)
+        self.assertEqual(sequentiel, parallele)
+        self.assertEqual(tournoi.jouer_duel('heuristique', 'aucun', precision=0.0, donnes_max=300, taille_lot=100,
+                                            processus=2), sequentiel)
+        self.assertEqual(sequentiel.parties, 600)
+        self.assertEqual(sequentiel.victoires_a + sequentiel.victoires_b + sequentiel.egalites, 600)
+        self.assertGreater(sequentiel.score, 0.6)
+    
+    def test_arret_sur_precision(self) -> None:
+        resultat = tournoi.jouer_duel('heuristique', 'aucun', precision=0.05, taille_lot=50)
+        self.assertLessEqual(resultat.demi_largeur(), 0.05)
+        self.assertLess(resultat.donnes, tournoi.DONNES_MAX)
+        
+        with self.assertRaises(ValueError):
+            tournoi.jouer_duel('heuristique', 'inconnue')
+    
+    def test_tournoi(self) -> None:
+        confrontations = list(tournoi.jouer_tournoi(['aucun', 'heuristique', 'aucun'], precision=0.05, taille_lot=50))
+        self.assertEqual([(i, j) for i, j, _ in confrontations], [(0, 1), (0, 2), (1, 2)])
+        self.assertEqual(confrontations[1][2].score, 0.5)
+        self.assertAlmostEqual(confrontations[0][2].score, 1 - confrontations[2][2].score, delta=0.1)
+
+class TestPartiesAuto(unittest.TestCase):
+    def test_jouer_parties(self) -> None:
+        statistiques = parties_auto.jouer_parties(400, joueur='aucun', graine=3, taille_lot=100)
+        
+        self.assertEqual(statistiques.parties, 400)
+        self.assertEqual(statistiques.victoires_joueur + statistiques.victoires_ordi + statistiques.egalites, 400)
+        self.assertEqual(sum(statistiques.categories_joueur), 400)
+        self.assertGreater(statistiques.parties_par_seconde, 0)
+        self.assertEqual(statistiques.en_dict()['parties'], 400)
+    
+    def test_multiprocessus_identique(self) -> None:
+        seul = parties_auto.jouer_parties(300, graine=9, taille_lot=100)
+        parallele = parties_auto.jouer_parties(300, graine=9, taille_lot=100, processus=2)
+        
+        self.assertEqual(seul.victoires_joueur, parallele.victoires_joueur)
+        self.assertEqual(seul.categories_ordi, parallele.categories_ordi)
+    
+    def test_strategie_inconnue(self) -> None:
+        with self.assertRaises(ValueError):
+            parties_auto.jouer_parties(10, joueur='bluff')
+
+class TestBenchmarks(unittest.TestCase):
+    def test_main_de_force(self) -> None:
+        generateur = random.Random(1)
+        for force in range(1, NOMBRE_FORCES + 1):
+            self.assertEqual(benchmarks.main_de_force(force, generateur).force(), force)
+    
+    def test_comparer_reference(self) -> None:
+        reference = {'evaluer_melange': 1000.0, 'partie': 100.0}
+        resultats = {'evaluer_melange': 700.0, 'partie': 95.0, 'carte': 10.0}
+        
+        regressions = benchmarks.comparer_reference(resultats, reference, seuil=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('evaluer_melange'))
+    
+    def test_executer(self) -> None:
+        resultats = benchmarks.executer(filtre='parser', repetitions=1)
+        self.assertEqual(list(resultats), ['parser_carte'])
+        self.assertGreater(resultats['parser_carte'], 0)
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self) -> None:
+        instrumentation.desactiver()
+        instrumentation.reinitialiser()
+    
+    def test_activer_et_desactiver(self) -> None:
+        evaluer = Main.evaluer
+        comparer = jeu_poker.comparer_mains
+        
+        instrumentation.activer()
+        self.assertTrue(instrumentation.est_active())
+        self.assertIsNot(Main.evaluer, evaluer)
+        self.assertIs(jeu_poker.comparer_mains, poker.comparer_mains)
+        
+        instrumentation.desactiver()
+        self.assertIs(Main.evaluer, evaluer)
+        self.assertIs(jeu_poker.comparer_mains, comparer)
+    
+    def test_instantane(self) -> None:
+        with instrumentation.instrumenter():
+            parties_auto.jouer_parties(50, graine=1)
+            Main([Carte(rang, 'Coeur') for rang in ['As', 'Roi', 'Dame', 'Valet', '10']]).evaluer()
+        
+        donnees = instrumentation.instantane()
+        self.assertEqual(donnees['fonctions']['JeuPoker.determiner_gagnant']['appels'], 50)
+        self.assertEqual(donnees['fonctions']['comparer_mains']['appels'], 50)
+        self.assertEqual(donnees['fonctions']['Main.evaluer']['appels'], 1)
+        self.assertEqual(donnees['categories']['Quinte Flush Royale'], 1)
+        self.assertEqual(sum(donnees['categories'].values()), 101)
+        self.assertIn('forces', donnees['caches'])
+        self.assertEqual(donnees['caches']['probabilites'], probabilites.statistiques_cache())
+        
+        self.assertEqual(json.loads(instrumentation.exporter_json())['categories'], donnees['categories'])
+        texte = instrumentation.exporter_prometheus()
+        self.assertIn('poker_cache_succes_total{cache="probabilites"}', texte)
+        self.assertIn('poker_appels_total{fonction="JeuPoker.distribuer_main"} 100', texte)
+        self.assertIn('quantile="0.99"', texte)
+
+class TestHistorique(unittest.TestCase):
+    def test_parser_main(self) -> None:
+        cartes = historique.parser_main("AC, 10♥ Valet Pique KT DD\n")
+        self.assertEqual([str(carte) for carte in cartes], ["As♥", "10♥", "Valet♠", "Roi♣", "Dame♦"])
+        
+        for forme, (rang, couleur) in [("VP", ("Valet", "Pique")), ("As Coeur", ("As", "Coeur")), ("7♦", ("7", "Carreau"))]:
+            self.assertEqual(parser_carte(forme), (rang, couleur))
+            self.assertIs(historique.CARTES_PAR_JETON[forme], Carte(rang, couleur))
+        
+        with self.assertRaises(ValueError):
+            historique.parser_main("AC 10C VC RC")
+        with self.assertRaises(ValueError):
+            historique.parser_main("AC AC VC RC DC")
+        with self.assertRaises(ValueError):
+            historique.parser_main("AC 1C VC RC DC")
+    
+    def test_traiter_avec_erreurs(self) -> None:
+        lignes = ["AC RC DC VC 10C", "", "2C 2K 2T 2P 3C", "AC ZZ 3C 4C 5C", "9P 8P 7C 6C 5C"]
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'historique.txt')
+            with open(chemin, 'w', encoding='utf-8') as fichier:
+                fichier.write("\n".join(lignes) + "\n")
+            
+            for utiliser_mmap in (False, True):
+                sortie = io.StringIO()
+                erreurs = io.StringIO()
+                bilan = historique.traiter(historique.lire_lignes(chemin, utiliser_mmap), sortie, erreurs)
+                
+                self.assertEqual((bilan.lignes, bilan.mains, bilan.erreurs), (5, 3, 1))
+                self.assertEqual(bilan.categories[9] + bilan.categories[7] + bilan.categories[4], 3)
+                self.assertEqual(sortie.getvalue().splitlines()[0], f"{NOMBRE_FORCES}\tQuinte Flush Royale")
+                self.assertIn("ligne 4", erreurs.getvalue())
+
+class TestMoteurEchange(unittest.TestCase):
+    def test_repartition_forces(self) -> None:
+        nombres = moteur_echange.repartition_forces()
+        self.assertEqual(sum(nombres), 2598960)
+        self.assertEqual(nombres[NOMBRE_FORCES], 4)
+        self.assertAlmostEqual(moteur_echange.PROBA_VICTOIRE[NOMBRE_FORCES], 1.0, places=5)
+    
+    def test_choisir_echange(self) -> None:
+        quinte: Main = Main([
+            Carte('9', 'Coeur'),
+            Carte('8', 'Trèfle'),
+            Carte('7', 'Pique'),
+            Carte('6', 'Carreau'),
+            Carte('5', 'Coeur')
+        ])
+        self.assertEqual(moteur_echange.choisir_echange(quinte), [])
+        
+        brelan: Main = Main([
+            Carte('Roi', 'Pique'),
+            Carte('Roi', 'Trèfle'),
+            Carte('Roi', 'Carreau'),
+            Carte('7', 'Carreau'),
+            Carte('3', 'Pique')
+        ])
+        self.assertEqual(moteur_echange.choisir_echange(brelan), [3, 4])
+    
+    def test_cache_par_forme_canonique(self) -> None:
+        main1: Main = Main([
+            Carte('Dame', 'Coeur'),
+            Carte('Dame', 'Pique'),
+            Carte('9', 'Coeur'),
+            Carte('6', 'Trèfle'),
+            Carte('2', 'Carreau')
+        ])
+        main2: Main = Main([
+            Carte('Dame', 'Trèfle'),
+            Carte('Dame', 'Carreau'),
+            Carte('9', 'Trèfle'),
+            Carte('6', 'Pique'),
+            Carte('2', 'Coeur')
+        ])
+        
+        decision = moteur_echange.choisir_echange(main1)
+        avant = moteur_echange.statistiques_cache()
+        self.assertEqual(moteur_echange.choisir_echange(main2), decision)
+        self.assertEqual(moteur_echange.statistiques_cache()['succes'], avant['succes'] + 1)
+        self.assertNotIn(0, decision)
+        self.assertNotIn(1, decision)
+    
+    def test_strategie_dans_jeu(self) -> None:
+        jeu = JeuPoker(strategie_ordi=moteur_echange.choisir_echange)
+        jeu.nouvelle_partie()
+        indices = moteur_echange.choisir_echange(jeu.main_ordi)
+        gardees = [carte for i, carte in enumerate(jeu.main_ordi.cartes) if i not in indices]
+        
+        jeu.echanger_cartes_ordi()
+        
+        self.assertEqual(len(jeu.main_ordi.cartes), 5)
+        self.assertEqual(len(jeu.jeu), 47 - len(indices))
+        self.assertTrue(all(carte in jeu.main_ordi.cartes for carte in gardees))
+
+class TestSimulation(unittest.TestCase):
+    def test_reproductible_quel_que_soit_le_nombre_de_processus(self) -> None:
+        cartes = [Carte('As', 'Coeur'), Carte('As', 'Pique')]
+        seul = simulation.estimer_equite(cartes, essais=3000, graine=4, taille_bloc=500)
+        parallele = simulation.estimer_equite(cartes, essais=3000, graine=4, taille_bloc=500, processus=2)
+        
+        self.assertEqual(seul, parallele)
+        self.assertEqual(seul.essais, 3000)
+        self.assertGreater(seul.equite, 0.8)
+    
+    def test_arret_sur_erreur_cible(self) -> None:
+        resultat = simulation.estimer_equite([], adversaires=2, essais=50_000, erreur_cible=0.02, taille_bloc=200)
+        self.assertLess(resultat.essais, 50_000)
+        self.assertLessEqual(resultat.erreur_type, 0.02)
+    
+    def test_partage_entre_plusieurs_joueurs(self) -> None:
+        # Une égalité à trois ne rapporte qu'un tiers du pot.
+        resultat = simulation.ResultatEquite(1, 3, 0, 1 / 2 + 2 / 3, 1 / 4 + 2 / 9)
+        self.assertAlmostEqual(resultat.equite, (1 + 1 / 2 + 2 / 3) / 4)
+        self.assertEqual(simulation.ResultatEquite(1, 2, 1).equite, 0.5)
+        self.assertAlmostEqual((simulation.ResultatEquite(1, 2, 1) + resultat).equite, (2 + 1 + 1 / 2 + 2 / 3) / 8)
+        
+        # Sans carte connue, les trois joueurs sont interchangeables : l'équité vaut 1/3.
+        gardees = [carte for carte in CARTES if carte.rang in ('As', 'Roi', 'Dame', 'Valet', '10') and carte.couleur != 'Pique']
+        mortes = [carte for carte in CARTES if carte not in gardees]
+        resultat = simulation.estimer_equite([], adversaires=2, essais=20_000, mortes=mortes, graine=7)
+        self.assertLess(resultat.parts_egalites, resultat.egalites / 2)
+        self.assertAlmostEqual(resultat.equite, 1 / 3, delta=4 * resultat.erreur_type)
+    
+    def test_parametres_invalides(self) -> None:
+        with self.assertRaises(ValueError):
+            simulation.estimer_equite(CARTES[:6])
+        with self.assertRaises(ValueError):
+            simulation.estimer_equite(CARTES[:2], mortes=CARTES[1:3])
+        with self.assertRaises(ValueError):
+            simulation.estimer_equite(CARTES[:2], adversaires=10)
+
+class TestServeur(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.serveur = serveur.ServeurPoker(graine=16)
+        self.ecoute = await self.serveur.demarrer()
+        self.port = self.ecoute.sockets[0].getsockname()[1]
+    
+    async def asyncTearDown(self) -> None:
+        self.ecoute.close()
+        await self.ecoute.wait_closed()
+    
+    async def test_protocole(self) -> None:
+        lecteur, ecrivain = await asyncio.open_connection('127.0.0.1', self.port)
+        
+        async def requete(commande: str) -> str:
+            ecrivain.write((commande + "\n").encode('utf-8'))
+            return (await lecteur.readline()).decode('utf-8').strip()
+        
+        reponse = await requete("NOUVELLE")
+        self.assertTrue(reponse.startswith("TABLE "))
+        identifiant = reponse.split()[1]
+        
+        self.assertEqual(await requete(f"MAIN {identifiant} AC RC DC VC 10C"), f"MAIN {identifiant} AC RC DC VC 10C")
+        self.assertTrue((await requete(f"MAIN {identifiant} AC RC DC VC")).startswith("ERREUR"))
+        self.assertTrue((await requete("ABATTRE 999")).startswith("ERREUR table inconnue"))
+        self.assertTrue((await requete(f"SAUTER {identifiant}")).startswith("ERREUR commande inconnue"))
+        
+        mots = (await requete(f"ECHANGER {identifiant}")).split()
+        self.assertEqual(mots[2:], ["AC", "RC", "DC", "VC", "10C"])
+        mots = (await requete(f"ABATTRE {identifiant}")).split()
+        self.assertEqual(mots[:3], ["RESULTAT", identifiant, "joueur"])
+        self.assertTrue((await requete(f"ECHANGER {identifiant} 0")).startswith("ERREUR aucune partie"))
+        
+        await requete(f"NOUVELLE {identifiant}")
+        main = historique.parser_main((await requete(f"DISTRIBUER {identifiant}")).split(maxsplit=2)[2])
+        self.assertEqual(len(set(main)), 5)
+        self.assertEqual(await requete("STATS"), "STATS tables=1 parties=1 connexions=1")
+        self.assertEqual(await requete(f"FERMER {identifiant}"), f"FERMEE {identifiant}")
+        
+        self.assertEqual(await requete("QUITTER"), "AU REVOIR")
+        self.assertEqual(await lecteur.readline(), b"")
+        ecrivain.close()
+    
+    async def test_paquet_epuise(self) -> None:
+        lecteur, ecrivain = await asyncio.open_connection('127.0.0.1', self.port)
+        
+        async def requete(commande: str) -> str:
+            ecrivain.write((commande + "\n").encode('utf-8'))
+            return (await lecteur.readline()).decode('utf-8').strip()
+        
+        autre = (await requete("NOUVELLE")).split()[1]
+        identifiant = (await requete("NOUVELLE")).split()[1]
+        await requete(f"DISTRIBUER {identifiant}")
+        reponses = [await requete(f"ECHANGER {identifiant} 0 1 2 3 4") for _ in range(9)]
+        self.assertTrue(all(reponse.startswith("MAIN") for reponse in reponses[:8]))
+        self.assertEqual(reponses[-1], "ERREUR plus assez de cartes dans le jeu pour cet échange")
+        
+        # Il reste 2 cartes : l'ordinateur abat ou reçoit la même erreur, sans couper la connexion.
+        reponse = await requete(f"ABATTRE {identifiant}")
+        self.assertTrue(reponse.startswith(("RESULTAT", "ERREUR plus assez de cartes")), reponse)
+        self.assertTrue((await requete(f"DISTRIBUER {autre}")).startswith(f"MAIN {autre}"))
+        self.assertEqual(await requete("QUITTER"), "AU REVOIR")
+        ecrivain.close()
+    
+    async def test_generer_charge(self) -> None:
+        bilan = await client_charge.generer_charge(port=self.port, tables=20, parties=3)
+        self.assertEqual((bilan['parties'], bilan['erreurs']), (60, 0))
+        self.assertEqual(bilan['latences']['appels'], 20 * 3 * 4 + 20)
+        self.assertEqual(self.serveur.parties_jouees, 60)
+        
+        for _ in range(100):
+            if not self.serveur.connexions:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual((self.serveur.connexions, self.serveur.tables_ouvertes), (0, 0))
+    
+    async def test_strategie_deportee(self) -> None:
+        appels: List[str] = []
+        
+        def strategie(main: Main) -> List[int]:
+            appels.append(str(main))
+            return [0, 1]
+        
+        self.serveur.strategie_ordi = strategie
+        self.serveur.deporter = True
+        bilan = await client_charge.generer_charge(port=self.port, tables=5, parties=2)
+        self.assertEqual(bilan['parties'], 10)
+        self.assertEqual(len(appels), 10)
+    
+    async def test_limite_tables(self) -> None:
+        self.serveur.tables_max = 2
+        bilan = await client_charge.generer_charge(port=self.port, tables=4, parties=1)
+        self.assertEqual(bilan['parties'] + bilan['erreurs'], 4)
+        self.assertGreaterEqual(bilan['parties'], 2)
+
+class TestIsomorphisme(unittest.TestCase):
+    def test_canoniser_invariant_par_permutation(self) -> None:
+        generateur = random.Random(17)
+        for _ in range(200):
+            tirage = generateur.sample(CARTES, 8)
+            cartes, mortes = tirage[:5], tirage[5:]
+            permutation = generateur.sample(range(4), 4)
+            
+            def permuter(liste: List[Carte]) -> List[Carte]:
+                return [CARTES[carte.valeur << 2 | permutation[carte.indice_couleur]] for carte in liste]
+            
+            forme, formes_mortes, inverse = canoniser(cartes, mortes)
+            self.assertEqual(canoniser(permuter(cartes), permuter(mortes))[:2], (forme, formes_mortes))
+            self.assertEqual(indice_isomorphe(permuter(cartes)), indice_isomorphe(cartes))
+            self.assertEqual(sorted(carte.valeur << 2 | inverse[carte.indice_couleur] for carte in cartes), list(forme))
+            self.assertEqual(Main([CARTES[code] for code in forme]).force(), Main(cartes).force())
+    
+    def test_indices_isomorphes(self) -> None:
+        royale_coeur = Main([Carte(rang, 'Coeur') for rang in ['As', 'Roi', 'Dame', 'Valet', '10']])
+        royale_pique = Main([Carte(rang, 'Pique') for rang in ['As', 'Roi', 'Dame', 'Valet', '10']])
+        self.assertEqual(indice_isomorphe(royale_coeur.cartes), indice_isomorphe(royale_pique.cartes))
+        self.assertEqual(indice_isomorphe(royale_coeur.cartes), NOMBRE_CLASSES_ISOMORPHES - 1)
+        self.assertEqual(indice_isomorphe([Carte('2', couleur) for couleur in COULEURS] + [Carte('3', 'Coeur')]), 0)
+        
+        with self.assertRaises(ValueError):
+            indice_isomorphe([Carte('As', 'Coeur')] * 5)
+
+class TestTableForces(unittest.TestCase):
+    def test_indice_colex(self) -> None:
+        self.assertEqual(table_forces.indice_colex([0, 1, 2, 3, 4]), 0)
+        self.assertEqual(table_forces.indice_colex([4, 0, 3, 1, 2]), 0)
+        self.assertEqual(table_forces.indice_colex([0, 1, 2, 3, 5]), 1)
+        self.assertEqual(table_forces.indice_colex([47, 48, 49, 50, 51]), table_forces.NOMBRE_MAINS - 1)
+    
+    def test_table_mmap(self) -> None:
+        generateur = random.Random(11)
+        mains = [Main(generateur.sample(CARTES, 5)) for _ in range(300)]
+        attendu = [main.force() for main in mains]
+        
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'forces.bin')
+            table_forces.generer(chemin)
+            
+            table_forces.activer(chemin)
+            try:
+                self.assertEqual([main.force() for main in mains], attendu)
+                self.assertEqual(comparer_mains(mains[0], mains[1]), (attendu[0] > attendu[1]) - (attendu[0] < attendu[1]))
+                self.assertEqual(Main([Carte('As', 'Coeur')] * 5).force(), 0)
+            finally:
+                table_forces.desactiver()
+            
+            with open(chemin, 'r+b') as fichier:
+                fichier.truncate(1000)
+            with self.assertRaises(ValueError):
+                table_forces.TableForces(chemin)
+
+class TestFormatBinaire(unittest.TestCase):
+    def test_aller_retour(self) -> None:
+        generateur = random.Random(15)
+        mains = [Main(generateur.sample(CARTES, 5)) for _ in range(300)]
+        
+        with tempfile.TemporaryDirectory() as dossier:
+            for encodage in (format_binaire.ENCODAGE_OCTET, format_binaire.ENCODAGE_6_BITS):
+                for avec_force in (False, True):
+                    chemin = os.path.join(dossier, f'mains_{encodage}_{avec_force}.bin')
+                    with format_binaire.EcrivainMains(chemin, encodage, avec_force, taille_lot=64) as ecrivain:
+                        ecrivain.ecrire_lot(mains[:200])
+                    with format_binaire.EcrivainMains(chemin, encodage, avec_force) as ecrivain:
+                        ecrivain.ecrire_lot(mains[200:])
+                    
+                    taille = format_binaire.ENTETE.size + 300 * (5 if encodage == format_binaire.ENCODAGE_OCTET else 4) + 2 * avec_force * 300
+                    self.assertEqual(os.path.getsize(chemin), taille)
+                    
+                    with format_binaire.LecteurMains(chemin) as lecteur:
+                        self.assertEqual(len(lecteur), 300)
+                        for indice in (0, 199, 200, 299):
+                            codes, force = lecteur.enregistrement(indice)
+                            self.assertEqual(codes, tuple(carte.code for carte in mains[indice].cartes))
+                            self.assertEqual(force, mains[indice].force() if avec_force else 0)
+                        self.assertEqual([str(main) for main in lecteur], [str(main) for main in mains])
+                        vue = lecteur.vue()
+                        self.assertEqual(vue.shape, (300, lecteur.taille_enregistrement))
+                        self.assertEqual(vue[5, 0], mains[5].cartes[0].code if encodage == format_binaire.ENCODAGE_OCTET else format_binaire.empaqueter(lecteur.enregistrement(5)[0]) & 0xFF)
+                        with self.assertRaises(IndexError):
+                            lecteur.enregistrement(300)
+                        
+                        if np is not None:
+                            tableau = lecteur.tableau()
+                            codes = lecteur.codes_tableau()
+                            self.assertEqual(codes.tolist(), [[carte.code for carte in main.cartes] for main in mains])
+                            if avec_force:
+                                self.assertEqual(lecteur.tableau()['force'].tolist(), [main.force() for main in mains])
+                    
+                    # Les vues restent lisibles après la fermeture du lecteur.
+                    self.assertEqual(vue.shape, (300, lecteur.taille_enregistrement))
+                    self.assertEqual(bytes(vue.tolist()[0]), vue.tobytes()[:lecteur.taille_enregistrement])
+                    if np is not None:
+                        self.assertEqual(len(tableau), 300)
+                        self.assertEqual(codes.tolist()[0], [carte.code for carte in mains[0].cartes])
+            
+            with self.assertRaises(ValueError):
+                format_binaire.EcrivainMains(chemin, format_binaire.ENCODAGE_OCTET, True)
+            
+            # Un fichier coupé au milieu de ses données n'est pas complété par des zéros.
+            tronque = os.path.join(dossier, 'tronque.bin')
+            with format_binaire.EcrivainMains(tronque) as ecrivain:
+                ecrivain.ecrire_lot(mains[:10])
+            with open(tronque, 'r+b') as fichier:
+                fichier.truncate(format_binaire.ENTETE.size + 3 * 6)
+            with self.assertRaises(ValueError):
+                format_binaire.EcrivainMains(tronque)
+            self.assertEqual(os.path.getsize(tronque), format_binaire.ENTETE.size + 3 * 6)
+            
+            invalide = os.path.join(dossier, 'invalide.bin')
+            with open(invalide, 'wb') as fichier:
+                fichier.write(b'PASUNFICHIERDEMAINS')
+            with self.assertRaises(ValueError):
+                format_binaire.EcrivainMains(invalide)
+    
+    def test_conversion_texte(self) -> None:
+        lignes = ["AC RC DC VC 10C", "2♥ 2♦ 2♣ 2♠ 3 Coeur", "AC ZZ 3C 4C 5C", "", "9P 8P 7C 6C 5C"]
+        with tempfile.TemporaryDirectory() as dossier:
+            texte = os.path.join(dossier, 'historique.txt')
+            binaire = os.path.join(dossier, 'historique.bin')
+            with open(texte, 'w', encoding='utf-8') as fichier:
+                fichier.write("\n".join(lignes) + "\n")
+            
+            erreurs = io.StringIO()
+            self.assertEqual(format_binaire.texte_vers_binaire(texte, binaire, erreurs=erreurs), (3, 1))
+            self.assertIn("ligne 3", erreurs.getvalue())
+            
+            sortie = io.StringIO()
+            self.assertEqual(format_binaire.binaire_vers_texte(binaire, sortie), 3)
+            self.assertEqual(sortie.getvalue().splitlines(), ["AC RC DC VC 10C", "2C 2K 2T 2P 3C", "9P 8P 7C 6C 5C"])
+            
+            with open(binaire, 'r+b') as fichier:
+                fichier.write(b'XXXX')
+            with self.assertRaises(ValueError):
+                format_binaire.LecteurMains(binaire)
+
+@unittest.skipIf(np is None, "numpy n'est pas installé")
+class TestEvaluationLot(unittest.TestCase):
+    def test_evaluer_lot(self) -> None:
+        generateur = random.Random(5)
+        mains = [Main(generateur.sample(CARTES, 5)) for _ in range(2000)]
+        mains.append(Main([Carte(rang, 'Pique') for rang in ['As', 'Roi', 'Dame', 'Valet', '10']]))
+        mains.append(Main([Carte('As', couleur) for couleur in COULEURS] + [Carte('Roi', 'Coeur')]))
+        
+        forces = evaluation_lot.evaluer_lot(evaluation_lot.codes_mains(mains))
+        self.assertEqual(forces.tolist(), [main.force() for main in mains])
+        
+        doublons = np.array([[0, 1, 2, 3, 0], [5, 5, 5, 5, 5]], dtype=np.uint8)
+        self.assertEqual(evaluation_lot.evaluer_lot(doublons).tolist(),
+                         [Main([CARTES[code] for code in ligne]).force() for ligne in doublons.tolist()])
+        self.assertEqual(evaluation_lot.evaluer_lot(doublons).tolist(), [0, 0])
+        with self.assertRaises(ValueError):
+            evaluation_lot.comparer_lot(doublons, evaluation_lot.codes_mains(mains[:2]))
+        
+        # Une carte répétée peut aussi former une main valide (ici une paire).
+        paire = np.array([[0, 0, 5, 9, 13]], dtype=np.uint8)
+        self.assertEqual(evaluation_lot.evaluer_lot(paire).tolist(), [1278])
+        with self.assertRaises(ValueError):
+            evaluation_lot.comparer_lot(evaluation_lot.codes_mains(mains[:1]), paire)
+        
+        with self.assertRaises(ValueError):
+            evaluation_lot.evaluer_lot(np.zeros((3, 4), dtype=np.uint8))
+    
+    def test_comparer_lot(self) -> None:
+        generateur = random.Random(6)
+        mains1 = [Main(generateur.sample(CARTES, 5)) for _ in range(1000)]
+        mains2 = [Main(generateur.sample(CARTES, 5)) for _ in range(1000)]
+        
+        resultats = evaluation_lot.comparer_lot(evaluation_lot.codes_mains(mains1), evaluation_lot.codes_mains(mains2))
+        self.assertEqual(resultats.tolist(), [comparer_mains(m1, m2) for m1, m2 in zip(mains1, mains2)])
+    
+    def test_abattage_lot(self) -> None:
+        generateur = random.Random(18)
+        tables = []
+        for _ in range(500):
+            cartes = generateur.sample(CARTES, 30)
+            tables.append([Main(cartes[5 * i:5 * i + 5]) for i in range(6)])
+        
+        codes = np.stack([evaluation_lot.codes_mains(mains) for mains in tables])
+        forces, gagnants = evaluation_lot.abattage_lot(codes)
+        for mains, forces_table, gagnants_table in zip(tables, forces, gagnants):
+            abattage = classer_mains(mains)
+            self.assertEqual(forces_table.tolist(), abattage.forces)
+            self.assertEqual(np.flatnonzero(gagnants_table).tolist(), abattage.gagnants)
+        
+        with self.assertRaises(ValueError):
+            evaluation_lot.abattage_lot(codes[0])
+        
+        codes[3, 2] = [0, 0, 5, 9, 13]
+        with self.assertRaises(ValueError):
+            evaluation_lot.abattage_lot(codes)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,170 @@
+import argparse
+import math
+import random
+from collections import deque
+from concurrent.futures import Executor, Future
+from contextlib import ExitStack
+from itertools import combinations
+from statistics import NormalDist
+from typing import Deque, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from jeu_poker import JeuPoker, StrategieEchange
+from parties_auto import STRATEGIES, resoudre_strategie
+from poker import Carte, CARTES, comparer_mains
+from tables_partagees import executeur_partage
+
+TAILLE_LOT: int = 500
+PRECISION_DEFAUT: float = 0.01
+CONFIANCE_DEFAUT: float = 0.95
+DONNES_MAX: int = 200_000
+
+class ResultatDuel(NamedTuple):
+    donnes: int
+    points: int
+    points_carres: int
+    victoires_a: int
+    victoires_b: int
+    egalites: int
+    
+    @property
+    def parties(self) -> int:
+        return 2 * self.donnes
+    
+    @property
+    def score(self) -> float:
+        if not self.donnes:
+            return 0.5
+        return self.points / (4 * self.donnes)
+    
+    @property
+    def erreur_type(self) -> float:
+        if self.donnes < 2:
+            return math.inf
+        moyenne = self.score
+        carres = self.points_carres / (16 * self.donnes)
+        return math.sqrt(max(carres - moyenne * moyenne, 0.0) / (self.donnes - 1))
+    
+    def demi_largeur(self, confiance: float = CONFIANCE_DEFAUT) -> float:
+        return NormalDist().inv_cdf(0.5 + confiance / 2) * self.erreur_type
+    
+    def __add__(self, autre: object) -> 'ResultatDuel':
+        if not isinstance(autre, ResultatDuel):
+            return NotImplemented
+        return ResultatDuel(*(a + b for a, b in zip(self, autre)))
+
+def _jouer(jeu: JeuPoker, ordre: List[Carte], premier: StrategieEchange, second: StrategieEchange) -> int:
+    jeu.jeu = list(ordre)
+    jeu.strategie_ordi = second
+    jeu.main_ordi = jeu.distribuer_main()
+    jeu.main_joueur = jeu.distribuer_main()
+    jeu.echanger_cartes_joueur(premier(jeu.main_joueur))
+    jeu.echanger_cartes_ordi()
+    return comparer_mains(jeu.main_joueur, jeu.main_ordi)
+
+def _jouer_lot(nombre: int, strategie_a: Union[str, StrategieEchange], strategie_b: Union[str, StrategieEchange],
+               graine: int, lot: int) -> ResultatDuel:
+    # Chaque donne est jouée deux fois avec le même paquet, les stratégies
+    # échangeant leurs places : la chance des cartes s'annule en grande partie.
+    # Les paquets ne dépendent que de la graine et du lot, si bien que toutes les
+    # confrontations d'un tournoi se jouent sur les mêmes donnes.
+    a = resoudre_strategie(strategie_a)
+    b = resoudre_strategie(strategie_b)
+    generateur = random.Random(f"{graine}:{lot}")
+    jeu = JeuPoker()
+    points = points_carres = victoires_a = victoires_b = egalites = 0
+    
+    for _ in range(nombre):
+        ordre = generateur.sample(CARTES, 52)
+        donne = 0
+        for resultat in (_jouer(jeu, ordre, a, b), -_jouer(jeu, ordre, b, a)):
+            if resultat > 0:
+                donne += 2
+                victoires_a += 1
+            elif resultat < 0:
+                victoires_b += 1
+            else:
+                donne += 1
+                egalites += 1
+        points += donne
+        points_carres += donne * donne
+    
+    return ResultatDuel(nombre, points, points_carres, victoires_a, victoires_b, egalites)
+
+def jouer_duel(strategie_a: Union[str, StrategieEchange], strategie_b: Union[str, StrategieEchange],
+               precision: float = PRECISION_DEFAUT, confiance: float = CONFIANCE_DEFAUT,
+               donnes_max: int = DONNES_MAX, graine: int = 0, taille_lot: int = TAILLE_LOT,
+               executeur: Optional[Executor] = None, processus: int = 1) -> ResultatDuel:
+    resoudre_strategie(strategie_a)
+    resoudre_strategie(strategie_b)
+    if not 0 < confiance < 1:
+        raise ValueError(f"niveau de confiance non valide: {confiance}")
+    
+    tailles: List[int] = [min(taille_lot, donnes_max - debut) for debut in range(0, donnes_max, taille_lot)]
+    taches = ((taille, strategie_a, strategie_b, graine, lot) for lot, taille in enumerate(tailles))
+    resultat = ResultatDuel(0, 0, 0, 0, 0, 0)
+    
+    # Les lots sont cumulés dans leur ordre et l'arrêt n'est testé qu'entre deux
+    # lots : le résultat ne dépend pas du nombre de processus.
+    def arreter() -> bool:
+        return resultat.demi_largeur(confiance) <= precision
+    
+    with ExitStack() as pile:
+        if executeur is None and processus > 1:
+            executeur = pile.enter_context(executeur_partage(processus))
+        
+        if executeur is None:
+            for tache in taches:
+                resultat += _jouer_lot(*tache)
+                if arreter():
+                    break
+            return resultat
+        
+        en_cours: Deque['Future[ResultatDuel]'] = deque()
+        for tache in taches:
+            en_cours.append(executeur.submit(_jouer_lot, *tache))
+            if len(en_cours) < 2 * processus:
+                continue
+            resultat += en_cours.popleft().result()
+            if arreter():
+                break
+        else:
+            while en_cours:
+                resultat += en_cours.popleft().result()
+                if arreter():
+                    break
+        
+        for futur in en_cours:
+            futur.cancel()
+        return resultat
+
+def jouer_tournoi(strategies: Sequence[Union[str, StrategieEchange]], precision: float = PRECISION_DEFAUT,
+                  confiance: float = CONFIANCE_DEFAUT, donnes_max: int = DONNES_MAX, graine: int = 0,
+                  taille_lot: int = TAILLE_LOT, processus: int = 1) -> Iterator[Tuple[int, int, ResultatDuel]]:
+    with ExitStack() as pile:
+        executeur = pile.enter_context(executeur_partage(processus)) if processus > 1 else None
+        for i, j in combinations(range(len(strategies)), 2):
+            yield i, j, jouer_duel(strategies[i], strategies[j], precision, confiance, donnes_max,
+                                   graine, taille_lot, executeur, processus)
+
+def main() -> None:
+    analyseur = argparse.ArgumentParser(description="Tournoi entre stratégies d'échange sur donnes dupliquées")
+    analyseur.add_argument('strategies', nargs='+', choices=sorted(STRATEGIES))
+    analyseur.add_argument('--precision', type=float, default=PRECISION_DEFAUT,
+                           help="demi-largeur visée de l'intervalle de confiance du score")
+    analyseur.add_argument('--confiance', type=float, default=CONFIANCE_DEFAUT)
+    analyseur.add_argument('--donnes-max', type=int, default=DONNES_MAX, help="donnes au plus par confrontation")
+    analyseur.add_argument('--graine', type=int, default=0)
+    analyseur.add_argument('--processus', type=int, default=1)
+    arguments = analyseur.parse_args()
+    
+    if len(arguments.strategies) < 2:
+        analyseur.error("il faut au moins deux stratégies")
+    
+    for i, j, resultat in jouer_tournoi(arguments.strategies, arguments.precision, arguments.confiance,
+                                        arguments.donnes_max, arguments.graine, processus=arguments.processus):
+        print(f"{arguments.strategies[i]} contre {arguments.strategies[j]}: "
+              f"score {resultat.score:.4f} ± {resultat.demi_largeur(arguments.confiance):.4f} "
+              f"({resultat.donnes} donnes, {resultat.victoires_a}/{resultat.egalites}/{resultat.victoires_b})")
+
+if __name__ == "__main__":
+    main()